@@ -2,152 +2,294 @@
 Comprehensive database diagnostic script
 """
 import asyncio
-import asyncpg
 import sys
 import os
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 
 # Add the root directory to Python path
 root_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, root_dir)
 
 from src.core.config import get_settings
+from src.database.pool import get_pool, close_pool, table_exists
 
-async def diagnose_database():
+CHECKPOINT_TABLES = [
+    'conversation_checkpoints',
+    'conversation_writes',
+    'conversation_metrics',
+    'agent_performance_log'
+]
+
+CUSTOM_FUNCTIONS = [
+    'update_updated_at_column',
+    'cleanup_old_conversation_data'
+]
+
+
+@dataclass
+class DiagnosticResults:
+    """Results of the concurrent database checks, formatted after collection"""
+    version: str = ""
+    tables: List[str] = field(default_factory=list)
+    migration_table_exists: bool = False
+    applied_migrations: List[Dict[str, Any]] = field(default_factory=list)
+    checkpoint_tables: Dict[str, Optional[int]] = field(default_factory=dict)
+    exact_counts: bool = False
+    functions: List[str] = field(default_factory=list)
+    uuid_error: Optional[str] = None
+    timestamp_error: Optional[str] = None
+
+
+def _quote_ident(name: str) -> str:
+    """Quote a whitelisted table name as a SQL identifier"""
+    if name not in CHECKPOINT_TABLES:
+        raise ValueError(f"Unexpected table name: {name}")
+    return '"' + name.replace('"', '""') + '"'
+
+
+async def _check_version(conn) -> str:
+    return await conn.fetchval("SELECT version();")
+
+
+async def _check_tables(conn) -> List[str]:
+    tables = await conn.fetch("""
+        SELECT tablename FROM pg_tables
+        WHERE schemaname = 'public'
+        ORDER BY tablename;
+    """)
+    return [table['tablename'] for table in tables]
+
+
+async def _check_migrations(conn) -> tuple:
+    migration_exists = await table_exists(conn, 'schema_migrations')
+    if not migration_exists:
+        return False, []
+
+    applied_migrations = await conn.fetch("SELECT version, applied_at FROM schema_migrations ORDER BY applied_at;")
+    return True, [dict(migration) for migration in applied_migrations]
+
+
+async def _check_checkpoint_tables(conn, exact_counts: bool = False) -> Dict[str, Optional[int]]:
+    """Return record counts per checkpoint table, None for missing tables
+
+    Counts come from the planner estimate in pg_class.reltuples unless
+    exact_counts is set, in which case the existing tables are counted
+    with a single UNION ALL query.
+    """
+    rows = await conn.fetch("""
+        SELECT c.relname, c.reltuples::bigint AS approx
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public'
+        AND c.relkind = 'r'
+        AND c.relname = ANY($1::text[]);
+    """, CHECKPOINT_TABLES)
+    # reltuples is -1 for tables that have never been vacuumed or analyzed
+    found = {row['relname']: max(row['approx'], 0) for row in rows}
+
+    if exact_counts and found:
+        # Identifiers can't be bound, so only whitelisted names are quoted
+        # into the statement; the labels are bound so the text stays stable
+        existing = [table for table in CHECKPOINT_TABLES if table in found]
+        count_sql = " UNION ALL ".join(
+            f"SELECT ${i}::text AS relname, COUNT(*) AS total FROM {_quote_ident(table)}"
+            for i, table in enumerate(existing, start=1)
+        )
+        found = {row['relname']: row['total'] for row in await conn.fetch(count_sql, *existing)}
+
+    return {table: found.get(table) for table in CHECKPOINT_TABLES}
+
+
+async def _check_functions(conn) -> List[str]:
+    functions = await conn.fetch("""
+        SELECT p.proname FROM pg_proc p
+        JOIN pg_namespace n ON n.oid = p.pronamespace
+        WHERE n.nspname = 'public'
+        AND p.proname = ANY($1::text[]);
+    """, CUSTOM_FUNCTIONS)
+    return [func['proname'] for func in functions]
+
+
+async def _check_operation(conn, statement: str) -> Optional[str]:
+    """Run a basic statement, returning the error message on failure"""
+    try:
+        await conn.execute(statement)
+    except Exception as e:
+        return str(e)
+    return None
+
+
+async def _run_check(pool, check, *args):
+    """Run a single check on its own pooled connection"""
+    async with pool.acquire() as conn:
+        return await check(conn, *args)
+
+
+async def collect_diagnostics(pool, exact_counts: bool = False) -> DiagnosticResults:
+    """Run the independent checks concurrently and collect their results"""
+    (
+        version,
+        tables,
+        (migration_exists, applied_migrations),
+        checkpoint_tables,
+        functions,
+        uuid_error,
+        timestamp_error,
+    ) = await asyncio.gather(
+        _run_check(pool, _check_version),
+        _run_check(pool, _check_tables),
+        _run_check(pool, _check_migrations),
+        _run_check(pool, _check_checkpoint_tables, exact_counts),
+        _run_check(pool, _check_functions),
+        _run_check(pool, _check_operation, "SELECT gen_random_uuid();"),
+        _run_check(pool, _check_operation, "SELECT NOW();"),
+    )
+
+    return DiagnosticResults(
+        version=version,
+        tables=tables,
+        migration_table_exists=migration_exists,
+        applied_migrations=applied_migrations,
+        checkpoint_tables=checkpoint_tables,
+        exact_counts=exact_counts,
+        functions=functions,
+        uuid_error=uuid_error,
+        timestamp_error=timestamp_error
+    )
+
+
+def print_diagnostics(results: DiagnosticResults) -> None:
+    """Print collected check results in report order"""
+    print("\n2. Checking database version...")
+    print(f"[OK] PostgreSQL version: {results.version.split(',')[0]}")
+
+    print("\n3. Checking for existing tables...")
+    if results.tables:
+        print("[OK] Existing tables:")
+        for table in results.tables:
+            print(f"  - {table}")
+    else:
+        print("[WARN] No tables found")
+
+    print("\n4. Checking for migration tracking table...")
+    if results.migration_table_exists:
+        print("[OK] Migration tracking table exists")
+        if results.applied_migrations:
+            print("[OK] Applied migrations:")
+            for migration in results.applied_migrations:
+                print(f"  - {migration['version']} (applied: {migration['applied_at']})")
+        else:
+            print("[WARN] No migrations recorded")
+    else:
+        print("[WARN] Migration tracking table does not exist")
+
+    print("\n5. Checking for checkpoint tables...")
+    for table, count in results.checkpoint_tables.items():
+        if count is not None:
+            approx = "" if results.exact_counts else "~"
+            print(f"[OK] {table} exists ({approx}{count} records)")
+        else:
+            print(f"[WARN] {table} does not exist")
+
+    print("\n6. Checking for functions...")
+    if results.functions:
+        print("[OK] Custom functions found:")
+        for func in results.functions:
+            print(f"  - {func}")
+    else:
+        print("[WARN] No custom functions found")
+
+    print("\n7. Testing basic operations...")
+    if results.uuid_error is None:
+        print("[OK] UUID generation works")
+    else:
+        print(f"[ERROR] UUID generation failed: {results.uuid_error}")
+
+    if results.timestamp_error is None:
+        print("[OK] Timestamp functions work")
+    else:
+        print(f"[ERROR] Timestamp functions failed: {results.timestamp_error}")
+
+
+def scan_migration_file(path: str) -> tuple:
+    """Count statements and $$ markers in a migration file in one pass
+
+    The file is streamed line by line; a ';' only ends a statement when it
+    is outside a $$-quoted body.
+    """
+    statement_count = 0
+    dollar_quote_count = 0
+    in_dollar = False
+    pending = False  # non-whitespace seen since the last statement ended
+
+    with open(path, 'r') as f:
+        for line in f:
+            pos = 0
+            length = len(line)
+            while pos < length:
+                if line.startswith('$$', pos):
+                    dollar_quote_count += 1
+                    in_dollar = not in_dollar
+                    pending = True
+                    pos += 2
+                    continue
+                char = line[pos]
+                if char == ';' and not in_dollar:
+                    if pending:
+                        statement_count += 1
+                    pending = False
+                elif not char.isspace():
+                    pending = True
+                pos += 1
+
+    if pending:
+        statement_count += 1
+
+    return statement_count, dollar_quote_count
+
+
+async def diagnose_database(exact_counts: bool = False):
     """Run comprehensive database diagnostics"""
     settings = get_settings()
     database_url = settings.database_url
-    
+
     print(f"=== Database Diagnostics - {datetime.now()} ===")
     print(f"Database URL: {database_url.replace(database_url.split('@')[0].split('//')[1], '***')}")
-    
-    # Convert to asyncpg format if needed
-    if database_url.startswith("postgresql+asyncpg://"):
-        database_url = database_url.replace("postgresql+asyncpg://", "postgresql://")
-    
-    conn = None
+
     try:
         print("\n1. Testing database connection...")
-        conn = await asyncpg.connect(database_url)
-        print("[OK] Database connection successful")
-        
-        print("\n2. Checking database version...")
-        version = await conn.fetchval("SELECT version();")
-        print(f"[OK] PostgreSQL version: {version.split(',')[0]}")
-        
-        print("\n3. Checking for existing tables...")
-        tables = await conn.fetch("""
-            SELECT tablename FROM pg_tables 
-            WHERE schemaname = 'public' 
-            ORDER BY tablename;
-        """)
-        
-        if tables:
-            print("[OK] Existing tables:")
-            for table in tables:
-                print(f"  - {table['tablename']}")
-        else:
-            print("[WARN] No tables found")
-        
-        print("\n4. Checking for migration tracking table...")
-        migration_exists = await conn.fetchval("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables
-                WHERE table_schema = 'public'
-                AND table_name = 'schema_migrations'
-            );
-        """)
-        
-        if migration_exists:
-            print("[OK] Migration tracking table exists")
-            applied_migrations = await conn.fetch("SELECT version, applied_at FROM schema_migrations ORDER BY applied_at;")
-            if applied_migrations:
-                print("[OK] Applied migrations:")
-                for migration in applied_migrations:
-                    print(f"  - {migration['version']} (applied: {migration['applied_at']})")
-            else:
-                print("[WARN] No migrations recorded")
-        else:
-            print("[WARN] Migration tracking table does not exist")
-        
-        print("\n5. Checking for checkpoint tables...")
-        checkpoint_tables = [
-            'conversation_checkpoints',
-            'conversation_writes', 
-            'conversation_metrics',
-            'agent_performance_log'
-        ]
-        
-        for table in checkpoint_tables:
-            exists = await conn.fetchval(f"""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables
-                    WHERE table_schema = 'public'
-                    AND table_name = '{table}'
-                );
-            """)
-            
-            if exists:
-                count = await conn.fetchval(f"SELECT COUNT(*) FROM {table};")
-                print(f"[OK] {table} exists ({count} records)")
-            else:
-                print(f"[WARN] {table} does not exist")
-        
-        print("\n6. Checking for functions...")
-        functions = await conn.fetch("""
-            SELECT proname FROM pg_proc 
-            WHERE proname IN ('update_updated_at_column', 'cleanup_old_conversation_data')
-            AND pronamespace = (SELECT oid FROM pg_namespace WHERE nspname = 'public');
-        """)
-        
-        if functions:
-            print("[OK] Custom functions found:")
-            for func in functions:
-                print(f"  - {func['proname']}")
-        else:
-            print("[WARN] No custom functions found")
-        
-        print("\n7. Testing basic operations...")
-        try:
-            await conn.execute("SELECT gen_random_uuid();")
-            print("[OK] UUID generation works")
-        except Exception as e:
-            print(f"[ERROR] UUID generation failed: {e}")
-        
-        try:
-            await conn.execute("SELECT NOW();")
-            print("[OK] Timestamp functions work")
-        except Exception as e:
-            print(f"[ERROR] Timestamp functions failed: {e}")
-        
+        pool = await get_pool()
+        async with pool.acquire():
+            print("[OK] Database connection successful")
+
+        results = await collect_diagnostics(pool, exact_counts)
+        print_diagnostics(results)
+
         print("\n8. Checking migration file...")
         migration_file = "src/database/migrations/002_add_checkpoint_tables.sql"
         if os.path.exists(migration_file):
-            with open(migration_file, 'r') as f:
-                migration_content = f.read()
-            
-            # Split into individual statements
-            statements = [stmt.strip() for stmt in migration_content.split(';') if stmt.strip()]
-            print(f"[OK] Migration file contains {len(statements)} statements")
-            
+            statement_count, dollar_quote_count = scan_migration_file(migration_file)
+            print(f"[OK] Migration file contains {statement_count} statements")
+
             # Check for common issues
-            if '$$' in migration_content:
-                dollar_quote_count = migration_content.count('$$')
+            if dollar_quote_count:
                 if dollar_quote_count % 2 == 0:
                     print(f"[OK] Dollar-quoted strings properly closed ({dollar_quote_count//2} pairs)")
                 else:
                     print(f"[ERROR] Unmatched dollar-quoted strings ({dollar_quote_count} total)")
-            
+
         else:
             print(f"[ERROR] Migration file not found: {migration_file}")
-        
+
         print("\n=== Diagnostic Summary ===")
         print("If you see any [ERROR] or [WARN] symbols above, those need to be addressed.")
         print("\nRecommended actions:")
         print("1. If checkpoint tables don't exist, run: python reset_database.py")
         print("2. Then restart your application to trigger migrations")
         print("3. Check your .env file for correct database credentials")
-        
+
     except Exception as e:
         print(f"[ERROR] Database diagnostic failed: {e}")
         if "connection" in str(e).lower():
@@ -158,10 +300,9 @@ async def diagnose_database():
             print("4. Check if user has proper permissions")
         return False
     finally:
-        if conn:
-            await conn.close()
-    
+        await close_pool()
+
     return True
 
 if __name__ == "__main__":
-    asyncio.run(diagnose_database())
\ No newline at end of file
+    asyncio.run(diagnose_database(exact_counts="--exact-counts" in sys.argv))
\ No newline at end of file
@@ -2,7 +2,6 @@
 Database reset script for development/testing
 """
 import asyncio
-import asyncpg
 import sys
 import os
 
@@ -10,60 +9,56 @@ import os
 root_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, root_dir)
 
-from src.core.config import get_settings
+from src.database.pool import get_pool, close_pool
 
 async def reset_database():
     """Reset the database by dropping migration tracking and checkpoint tables"""
-    settings = get_settings()
-    database_url = settings.database_url
-    
-    # Convert to asyncpg format if needed
-    if database_url.startswith("postgresql+asyncpg://"):
-        database_url = database_url.replace("postgresql+asyncpg://", "postgresql://")
-    
-    conn = None
     try:
-        conn = await asyncpg.connect(database_url)
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            print("Dropping migration tracking and checkpoint tables...")
         
-        print("Dropping migration tracking and checkpoint tables...")
+            # Drop tables in reverse dependency order
+            tables_to_drop = [
+                'agent_performance_log',
+                'conversation_metrics', 
+                'conversation_writes',
+                'conversation_checkpoints',
+                'schema_migrations'
+            ]
         
-        # Drop tables in reverse dependency order
-        tables_to_drop = [
-            'agent_performance_log',
-            'conversation_metrics', 
-            'conversation_writes',
-            'conversation_checkpoints',
-            'schema_migrations'
-        ]
+            # Drop functions
+            functions_to_drop = [
+                'cleanup_old_conversation_data(INTEGER)',
+                'update_updated_at_column()'
+            ]
+        
+            # Send every DROP as one script; CASCADE removes any ordering
+            # constraint, and a multi-statement simple query runs as a single
+            # implicit transaction, so a failure leaves nothing half-dropped
+            reset_sql = ";\n".join(
+                [f"DROP TABLE IF EXISTS {table} CASCADE" for table in tables_to_drop] +
+                [f"DROP FUNCTION IF EXISTS {func} CASCADE" for func in functions_to_drop]
+            )
         
-        for table in tables_to_drop:
             try:
-                await conn.execute(f"DROP TABLE IF EXISTS {table} CASCADE;")
-                print(f"Dropped table: {table}")
+                await conn.execute(reset_sql)
             except Exception as e:
-                print(f"Error dropping {table}: {e}")
+                print(f"Error dropping tables and functions: {e}")
+                return False
         
-        # Drop functions
-        functions_to_drop = [
-            'cleanup_old_conversation_data(INTEGER)',
-            'update_updated_at_column()'
-        ]
-        
-        for func in functions_to_drop:
-            try:
-                await conn.execute(f"DROP FUNCTION IF EXISTS {func} CASCADE;")
+            for table in tables_to_drop:
+                print(f"Dropped table: {table}")
+            for func in functions_to_drop:
                 print(f"Dropped function: {func}")
-            except Exception as e:
-                print(f"Error dropping function {func}: {e}")
         
-        print("Database reset completed!")
+            print("Database reset completed!")
         
     except Exception as e:
         print(f"Error resetting database: {e}")
         return False
     finally:
-        if conn:
-            await conn.close()
+        await close_pool()
     
     return True
 
@@ -3,12 +3,14 @@ Base agent class and interfaces
 """
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional, Union
 from datetime import datetime
 import asyncio
-import json
+import re
 
-from pydantic import BaseModel
+from cachetools import TTLCache
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from src.core.logging import get_logger
 from src.database.models import AgentType, ConversationStatus
@@ -16,19 +18,55 @@ from src.cache.redis_client import cache_manager
 
 logger = get_logger(__name__)
 
+# Keyword sets used by AgentOrchestrator.route_message, built once at import
+TECHNICAL_KEYWORDS = frozenset({"technical", "not working", "error", "bug"})
+BILLING_KEYWORDS = frozenset({"billing", "payment", "invoice", "charge"})
+SALES_KEYWORDS = frozenset({"buy", "purchase", "pricing", "upgrade"})
+ESCALATION_KEYWORDS = frozenset({"complaint", "manager", "escalate"})
 
-class AgentMessage(BaseModel):
-    """Message structure for agent communication"""
+# Keyword -> target agent, scanned in a single pass. The lookahead makes
+# matches overlap so every keyword occurrence is seen; the first agent in
+# ROUTING_PRIORITY that matched wins, preserving the old if/elif order.
+KEYWORD_AGENTS: Dict[str, AgentType] = {
+    **dict.fromkeys(TECHNICAL_KEYWORDS, AgentType.TECHNICAL_SUPPORT),
+    **dict.fromkeys(BILLING_KEYWORDS, AgentType.BILLING),
+    **dict.fromkeys(SALES_KEYWORDS, AgentType.SALES),
+    **dict.fromkeys(ESCALATION_KEYWORDS, AgentType.ESCALATION),
+}
+ROUTING_PRIORITY = (
+    AgentType.TECHNICAL_SUPPORT,
+    AgentType.BILLING,
+    AgentType.SALES,
+    AgentType.ESCALATION,
+)
+_KEYWORD_PATTERN = re.compile(
+    "(?=(" + "|".join(
+        re.escape(keyword) for keyword in sorted(KEYWORD_AGENTS, key=len, reverse=True)
+    ) + "))"
+)
+
+# Process-local cache of recently saved contexts; Redis stays authoritative
+_context_cache: TTLCache = TTLCache(maxsize=1024, ttl=30)
+
+
+@dataclass(slots=True)
+class AgentMessage:
+    """Message structure for agent communication
+
+    In-process only, so it is a plain dataclass; validation happens at the
+    API boundary and when the context is persisted.
+    """
     content: str
-    metadata: Dict[str, Any] = {}
-    timestamp: datetime = datetime.now()
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    timestamp: datetime = field(default_factory=datetime.now)
 
 
-class AgentResponse(BaseModel):
+@dataclass(slots=True)
+class AgentResponse:
     """Agent response structure"""
     message: str
     action: Optional[str] = None
-    data: Dict[str, Any] = {}
+    data: Dict[str, Any] = field(default_factory=dict)
     should_escalate: bool = False
     escalation_reason: Optional[str] = None
     confidence: float = 1.0
@@ -37,17 +75,22 @@ class AgentResponse(BaseModel):
 
 class ConversationContext(BaseModel):
     """Conversation context shared between agents"""
+    model_config = ConfigDict(arbitrary_types_allowed=True, extra='ignore')
+
     conversation_id: str
     customer_id: str
     channel: str
     status: ConversationStatus
-    messages: List[Dict[str, Any]] = []
-    customer_data: Dict[str, Any] = {}
-    session_data: Dict[str, Any] = {}
+    messages: List[Dict[str, Any]] = Field(default_factory=list)
+    customer_data: Dict[str, Any] = Field(default_factory=dict)
+    session_data: Dict[str, Any] = Field(default_factory=dict)
     current_intent: Optional[str] = None
     sentiment: Optional[str] = None
     priority: str = "medium"
-    metadata: Dict[str, Any] = {}
+    metadata: Dict[str, Any] = Field(default_factory=dict)
+
+    # Number of leading messages already pushed to the cache
+    _persisted_messages: int = PrivateAttr(default=0)
 
 
 class BaseAgent(ABC):
@@ -60,6 +103,9 @@ class BaseAgent(ABC):
         self.description = self.config.get("description", "")
         self.tools = self.config.get("tools", [])
         self.escalation_conditions = self.config.get("escalation_conditions", {})
+        self._escalation_keywords = tuple(
+            keyword.lower() for keyword in self.escalation_conditions.get("keywords", [])
+        )
         
     @abstractmethod
     async def process_message(self, message: AgentMessage, 
@@ -92,9 +138,9 @@ class BaseAgent(ABC):
             return True
         
         # Check for specific keywords
-        escalation_keywords = self.escalation_conditions.get("keywords", [])
-        for keyword in escalation_keywords:
-            if keyword.lower() in response.message.lower():
+        if self._escalation_keywords:
+            message_lower = response.message.lower()
+            if any(keyword in message_lower for keyword in self._escalation_keywords):
                 return True
                 
         # Check sentiment
@@ -106,13 +152,14 @@ class BaseAgent(ABC):
     async def update_context(self, context: ConversationContext, 
                            response: AgentResponse) -> ConversationContext:
         """Update conversation context after processing"""
+        now_iso = datetime.now().isoformat()
         
         # Add agent response to messages
         context.messages.append({
             "role": "agent",
             "agent_type": self.agent_type.value,
             "content": response.message,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso,
             "metadata": response.data
         })
         
@@ -122,7 +169,7 @@ class BaseAgent(ABC):
         
         # Update metadata
         context.metadata[f"last_{self.agent_type.value}_response"] = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso,
             "confidence": response.confidence,
             "action": response.action
         }
@@ -131,22 +178,40 @@ class BaseAgent(ABC):
     
     async def load_context(self, conversation_id: str) -> Optional[ConversationContext]:
         """Load conversation context from cache"""
-        context_data = await cache_manager.get_conversation_context(conversation_id)
-        if context_data:
+        context = _context_cache.get(conversation_id)
+        if context is not None:
+            return context
+        
+        head = await cache_manager.get_conversation_head(conversation_id)
+        if head:
             try:
-                return ConversationContext(**context_data)
+                messages = await cache_manager.get_conversation_messages(conversation_id)
+                context = ConversationContext(**head, messages=messages)
+                context._persisted_messages = len(messages)
+                _context_cache[conversation_id] = context
+                return context
             except Exception as e:
                 logger.error(f"Failed to load context for conversation {conversation_id}: {e}")
         return None
     
     async def save_context(self, context: ConversationContext) -> None:
-        """Save conversation context to cache"""
+        """Save conversation context to cache
+
+        Messages are append-only, so only the ones added since the last
+        load/save are pushed; the rest of the context is written as a
+        single head document.
+        """
         try:
-            await cache_manager.set_conversation_context(
+            new_messages = context.messages[context._persisted_messages:]
+            if await cache_manager.append_messages(context.conversation_id, new_messages):
+                context._persisted_messages = len(context.messages)
+            await cache_manager.set_conversation_head(
                 context.conversation_id, 
-                context.dict()
+                context.model_dump(mode='python', exclude={"messages"})
             )
+            _context_cache[context.conversation_id] = context
         except Exception as e:
+            _context_cache.pop(context.conversation_id, None)
             logger.error(f"Failed to save context for conversation {context.conversation_id}: {e}")
     
     async def get_agent_state(self, conversation_id: str) -> Dict[str, Any]:
@@ -167,12 +232,56 @@ class BaseAgent(ABC):
         )
 
 
+def _compile_router(routing_rules: Dict[str, AgentType]):
+    """Build a routing function specialised for a set of routing rules
+
+    The rules are frozen into a tuple and the keyword tables are bound as
+    closure variables, so routing a message does no attribute or global
+    lookups. Rebuilt whenever the rules change.
+    """
+    intent_rules = tuple(routing_rules.items())
+    find_keywords = _KEYWORD_PATTERN.finditer
+    keyword_agents = KEYWORD_AGENTS
+    priority = ROUTING_PRIORITY
+    top_priority = ROUTING_PRIORITY[0]
+    routing_agent = AgentType.ROUTING
+    default_agent = AgentType.CUSTOMER_SERVICE
+
+    def route(message: AgentMessage, context: ConversationContext) -> AgentType:
+        # If there's a current agent and no escalation needed, continue with it
+        current_intent = context.current_intent
+        if intent_rules and current_intent and not message.metadata.get("force_routing"):
+            for intent, agent_type in intent_rules:
+                if intent in current_intent:
+                    return agent_type
+
+        # Default routing logic
+        if not context.messages:
+            return routing_agent
+
+        # Check for specific intents in the message
+        matched = set()
+        for match in find_keywords(message.content.lower()):
+            agent_type = keyword_agents[match.group(1)]
+            if agent_type is top_priority:
+                return agent_type
+            matched.add(agent_type)
+
+        for agent_type in priority:
+            if agent_type in matched:
+                return agent_type
+        return default_agent
+
+    return route
+
+
 class AgentOrchestrator:
     """Orchestrates communication between different agents"""
     
     def __init__(self):
         self.agents: Dict[AgentType, BaseAgent] = {}
         self.routing_rules: Dict[str, AgentType] = {}
+        self._route = _compile_router(self.routing_rules)
     
     def register_agent(self, agent: BaseAgent) -> None:
         """Register an agent with the orchestrator"""
@@ -182,34 +291,12 @@ class AgentOrchestrator:
     def set_routing_rules(self, rules: Dict[str, AgentType]) -> None:
         """Set routing rules for intent-based agent selection"""
         self.routing_rules = rules
+        self._route = _compile_router(rules)
     
     async def route_message(self, message: AgentMessage, 
                           context: ConversationContext) -> AgentType:
         """Route message to appropriate agent based on context"""
-        
-        # If there's a current agent and no escalation needed, continue with it
-        if context.current_intent and not message.metadata.get("force_routing"):
-            for intent, agent_type in self.routing_rules.items():
-                if intent in context.current_intent:
-                    return agent_type
-        
-        # Default routing logic
-        if not context.messages:
-            return AgentType.ROUTING
-        
-        # Check for specific intents in the message
-        message_lower = message.content.lower()
-        
-        if any(word in message_lower for word in ["technical", "not working", "error", "bug"]):
-            return AgentType.TECHNICAL_SUPPORT
-        elif any(word in message_lower for word in ["billing", "payment", "invoice", "charge"]):
-            return AgentType.BILLING
-        elif any(word in message_lower for word in ["buy", "purchase", "pricing", "upgrade"]):
-            return AgentType.SALES
-        elif any(word in message_lower for word in ["complaint", "manager", "escalate"]):
-            return AgentType.ESCALATION
-        else:
-            return AgentType.CUSTOMER_SERVICE
+        return self._route(message, context)
     
     async def process_conversation(self, message: AgentMessage, 
                                  context: ConversationContext) -> AgentResponse:
@@ -218,7 +305,8 @@ class AgentOrchestrator:
         # Route to appropriate agent
         target_agent_type = await self.route_message(message, context)
         
-        if target_agent_type not in self.agents:
+        agent = self.agents.get(target_agent_type)
+        if agent is None:
             logger.error(f"Agent {target_agent_type} not registered")
             return AgentResponse(
                 message="I'm sorry, but I'm unable to process your request right now. Please try again later.",
@@ -226,9 +314,6 @@ class AgentOrchestrator:
                 escalation_reason="Agent not available"
             )
         
-        # Get the agent
-        agent = self.agents[target_agent_type]
-        
         try:
             # Process message
             response = await agent.process_message(message, context)
@@ -236,14 +321,14 @@ class AgentOrchestrator:
             # Update context
             updated_context = await agent.update_context(context, response)
             
-            # Save updated context
-            await agent.save_context(updated_context)
-            
             # Check for escalation
             if await agent.should_escalate(updated_context, response):
                 response.should_escalate = True
                 response.next_agent = self._get_escalation_agent(target_agent_type)
             
+            # Save once the escalation decision is final
+            await agent.save_context(updated_context)
+            
             return response
             
         except Exception as e:
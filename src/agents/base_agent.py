@@ -1,9 +1,75 @@
-from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+import inspect
+import sys
+from functools import partial
+from types import MappingProxyType
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Tuple
 from src.models.state import AgentState
 from src.services.tool_registry import Tool, ToolRegistry
 
-class BaseAgent(ABC):
+class _UnregisteredRegistry:
+    """Stand-in tool registry for agents that haven't been registered yet
+
+    Falsy like the ``None`` it replaces, but callable through the same
+    interface so tool dispatch doesn't need a null check.
+    """
+    
+    def __bool__(self) -> bool:
+        return False
+    
+    def execute_tool(self, tool_name: str, parameters: Dict[str, Any], agent_context: Dict[str, Any]):
+        raise RuntimeError("Tool registry not initialized")
+    
+    def get_tool_callable(self, tool_name: str) -> Callable[..., Awaitable[Dict[str, Any]]]:
+        return partial(self.execute_tool, tool_name)
+
+
+_UNREGISTERED_REGISTRY = _UnregisteredRegistry()
+
+
+class BaseAgent:
+    # The shared base attributes use slot descriptors; subclasses that don't
+    # declare __slots__ of their own keep a __dict__ for their attributes
+    __slots__ = (
+        "name",
+        "model",
+        "capabilities",
+        "required_tools",
+        "_required_tools_set",
+        "tools",
+        "confidence_threshold",
+        "tool_registry",
+        "_static_ctx",
+        "_tool_dispatch",
+    )
+    
+    # Shared, immutable permission set; agent types override this
+    _PERMISSIONS: Tuple[str, ...] = ()
+    
+    # Methods every concrete agent must implement. Checked once when the
+    # subclass is defined rather than through ABCMeta on every instantiation.
+    _REQUIRED_METHODS: Tuple[str, ...] = ("handle_message", "can_handle")
+    
+    # Set per subclass in __init_subclass__
+    _can_handle_is_async: bool = False
+    
+    # Escalation thresholds; agent types may override these
+    MAX_RESOLUTION_ATTEMPTS: int = 3
+    PLATINUM_SENTIMENT_THRESHOLD: float = 0.3
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        missing = [
+            method for method in BaseAgent._REQUIRED_METHODS
+            if getattr(cls, method) is getattr(BaseAgent, method)
+        ]
+        if missing:
+            raise TypeError(
+                f"{cls.__name__} must implement {', '.join(missing)}"
+            )
+        # Most agents decide synchronously; record the ones that need to
+        # await so callers only pay for a coroutine where there is one
+        cls._can_handle_is_async = inspect.iscoroutinefunction(cls.can_handle)
+    
     def __init__(
         self,
         name: str,
@@ -18,72 +84,104 @@ class BaseAgent(ABC):
         self.required_tools = tools
         self.tools = tools or []
         self.confidence_threshold = confidence_threshold
-        self.tool_registry: Optional[ToolRegistry] = None
+        self.tool_registry: ToolRegistry = _UNREGISTERED_REGISTRY
+        self._tool_dispatch: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]] = {}
+        self._bind_tools()
+        
+        # Tool-context fields that don't depend on the conversation; read-only
+        # so the per-call copies in get_agent_context can't leak back into it
+        self._static_ctx = MappingProxyType({
+            "agent_name": self.name,
+            "agent_type": type(self).__name__,
+            "capabilities": self.capabilities,
+            "permissions": self._get_agent_permissions()
+        })
     
     def register_tool_registry(self, registry: ToolRegistry):
         """Register the tool registry with the agent"""
         self.tool_registry = registry
+        self._bind_tools()
+    
+    def _bind_tools(self):
+        """Build the tool dispatch table against the current registry"""
+        # Subclasses may extend their tool list after __init__
+        # Interned so lookups with the literal names agents pass hit the
+        # identity fast path
+        self._required_tools_set = frozenset(
+            sys.intern(tool_name) for tool_name in self.required_tools or ()
+        )
+        self._tool_dispatch = {
+            tool_name: self.tool_registry.get_tool_callable(tool_name)
+            for tool_name in self._required_tools_set
+        }
         
-    @abstractmethod
     async def handle_message(
         self, 
         message: str, 
         state: AgentState
     ) -> Dict[str, Any]:
         """Handle an incoming message and return response"""
-        pass
+        raise NotImplementedError
+
+    def can_handle(self, state: AgentState) -> bool:
+        """Determine if this agent can handle the current state
+
+        Synchronous by default; agents that need I/O to decide may override
+        it with a coroutine function, flagged by ``_can_handle_is_async``.
+        """
+        raise NotImplementedError
 
-    @abstractmethod
-    async def can_handle(self, state: AgentState) -> bool:
-        """Determine if this agent can handle the current state"""
-        pass
+    async def can_handle_many(self, states: List[AgentState]) -> List[bool]:
+        """Determine which of several states this agent can handle
 
-    async def use_tool(
+        Lets a router fan one agent out over a batch of candidate states,
+        resolving the sync/async dispatch once per batch. Agents with
+        cheaper batch checks may override it.
+        """
+        can_handle = self.can_handle
+        if self._can_handle_is_async:
+            return [await can_handle(state) for state in states]
+        return [can_handle(state) for state in states]
+
+    def use_tool(
         self, 
         tool_name: str,
         parameters: Dict[str, Any],
         agent_context: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Execute a tool from the agent's available tools"""
-        if not self.tool_registry:
-            raise RuntimeError("Tool registry not initialized")
-            
-        if tool_name not in self.required_tools:
+    ) -> Awaitable[Dict[str, Any]]:
+        """Execute a tool from the agent's available tools
+
+        Returns the registry's coroutine directly; callers await it.
+        """
+        execute = self._tool_dispatch.get(tool_name)
+        if execute is None:
             raise ValueError(f"Tool {tool_name} not available to this agent")
             
-        return await self.tool_registry.execute_tool(
-            tool_name=tool_name,
-            parameters=parameters,
-            agent_context=agent_context
-        )
+        return execute(parameters, agent_context)
     
-    async def should_escalate(self, state: AgentState) -> bool:
+    def should_escalate(self, state: AgentState) -> bool:
         """Determine if the conversation should be escalated"""
-        # Basic escalation criteria
-        if state.confidence_score < self.confidence_threshold:
-            return True
-            
-        if len(state.resolution_attempts) >= 3:
-            return True
-            
-        if state.customer and state.customer.tier == "PLATINUM":
-            if state.sentiment_score < 0.3:  # Negative sentiment
-                return True
-        
-        return False
+        # Basic escalation criteria, cheapest checks first; the last one is
+        # negative sentiment from a platinum customer
+        resolution_attempts = state.resolution_attempts
+        customer = state.customer
+        return (
+            state.confidence_score < self.confidence_threshold
+            or (resolution_attempts is not None
+                and len(resolution_attempts) >= self.MAX_RESOLUTION_ATTEMPTS)
+            or (customer is not None
+                and customer.tier == "PLATINUM"
+                and state.sentiment_score < self.PLATINUM_SENTIMENT_THRESHOLD)
+        )
     
     def get_agent_context(self, state: AgentState) -> Dict[str, Any]:
         """Get the context for tool execution"""
-        return {
-            "agent_name": self.name,
-            "agent_type": self.__class__.__name__,
-            "capabilities": self.capabilities,
-            "conversation_id": state.conversation_id,
-            "customer_id": state.customer.customer_id if state.customer else None,
-            "permissions": self._get_agent_permissions()
-        }
+        context = self._static_ctx.copy()
+        context["conversation_id"] = state.conversation_id
+        customer = state.customer
+        context["customer_id"] = customer.customer_id if customer else None
+        return context
     
-    def _get_agent_permissions(self) -> List[str]:
+    def _get_agent_permissions(self) -> Tuple[str, ...]:
         """Get the permissions available to this agent"""
-        # This should be implemented by each agent type
-        return []
\ No newline at end of file
+        return self._PERMISSIONS
\ No newline at end of file
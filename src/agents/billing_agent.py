@@ -2,10 +2,15 @@
 Billing Agent for Contact Center Agentic Flow System
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Awaitable, Dict, Any, List, Optional, Tuple
+from collections import Counter
 from datetime import datetime, timedelta
-from decimal import Decimal
+from functools import cache, lru_cache, partial
+import asyncio
 import re
+import secrets
+
+from cachetools import TTLCache
 
 from src.agents.base_agent import BaseAgent
 from src.models.state import AgentState, TicketStatus, CustomerTier, Priority
@@ -13,10 +18,655 @@ from src.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Lowercased text of recent messages. The same message is lowercased by
+# can_handle, the inquiry analysis and the resolver helpers in one turn, and
+# history turns again on every routing check; str caches its hash, so a
+# repeat lookup costs an identity comparison.
+_lowercase = lru_cache(maxsize=256)(str.lower)
+
+# Parsed charge dates. A dispute re-reads the same billing history on every
+# turn, so its dates repeat; datetimes are immutable and safe to share.
+_parse_date = lru_cache(maxsize=1024)(datetime.fromisoformat)
+
+def _fallback_reference(prefix: str) -> str:
+    """Reference number for when a tool result doesn't carry one"""
+    return f"{prefix}-{secrets.token_hex(5)}"
+
+
+# Follow-up windows, built once rather than per response
+_FOLLOW_UP_DELTA = timedelta(hours=24)
+_DISPUTE_FOLLOW_UP_DELTA = timedelta(days=2)
+
+
+def _follow_up_iso(delta: timedelta = _FOLLOW_UP_DELTA) -> str:
+    """Timestamp of a follow-up due ``delta`` from now"""
+    return (datetime.now() + delta).isoformat()
+
+
+# Read-only lookups keyed by the customer id alone (get_billing_summary is
+# always called with the same flags), so a customer's follow-up questions
+# can reuse a recent result
+_CACHEABLE_TOOLS = frozenset({
+    "get_subscription_details",
+    "check_refund_eligibility",
+    "get_billing_summary",
+    "get_account_overview",
+    "get_payment_methods",
+    "get_account_suspension_details",
+    "check_account_alerts",
+})
+
+# Per-call deadlines in seconds. A slow backend shouldn't hold the whole
+# turn, so a call that overruns raises TimeoutError into the handler's
+# escalation branch. The urgent paths get the tightest limits; calls that
+# change the account get longer ones than the read-only lookups.
+_TOOL_TIMEOUTS: Dict[str, float] = {
+    "apply_service_extension": 1.5,
+    "urgent_account_restoration": 1.5,
+    "verify_customer_identity": 3.0,
+    "retry_payment": 5.0,
+    "process_refund": 5.0,
+    "process_billing_adjustment": 5.0,
+    "create_billing_investigation": 5.0,
+    "attempt_account_restoration": 5.0,
+}
+_DEFAULT_TOOL_TIMEOUT = 2.0
+
+
+def _forget_failed_result(results: TTLCache, key: Tuple[str, str], task: asyncio.Task):
+    """Drop a cached tool call that failed, so the next lookup retries it"""
+    if (task.cancelled() or task.exception() is not None) and results.get(key) is task:
+        del results[key]
+
+# Monetary amounts mentioned in a message, e.g. "$1,250.00" or "40"
+_AMOUNT_PATTERN = re.compile(r'\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)')
+
+
+def _keyword_pattern(keywords) -> re.Pattern:
+    """Compile a keyword list into one alternation, so a single scan of the
+    text answers "does any of these keywords occur" """
+    return re.compile("|".join(
+        re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)
+    ))
+
+
+# Intents routed to the billing agent outright
+BILLING_INTENTS = frozenset({
+    "billing_inquiry", "payment_issue", "subscription_change", "refund_request",
+    "invoice_question", "account_balance", "payment_method_update", "billing_dispute",
+    "subscription_cancel", "upgrade_billing", "downgrade_billing", "credit_inquiry"
+})
+
+# Substrings that mark any other intent name as billing-related
+BILLING_INTENT_KEYWORDS = ("billing", "payment", "invoice", "subscription", "refund", "charge")
+
+# Keywords that mark a recent conversation turn as billing-related
+BILLING_KEYWORDS = (
+    "bill", "payment", "charge", "invoice", "subscription", "refund", "credit",
+    "balance", "card", "bank", "account", "fee", "cost", "price", "money"
+)
+_BILLING_KEYWORD_PATTERN = _keyword_pattern(BILLING_KEYWORDS)
+
+# Phrases that identify each kind of billing inquiry
+INQUIRY_TYPES = {
+    "payment_failure": (
+        "payment failed", "card declined", "payment error", "couldn't charge",
+        "payment unsuccessful", "transaction failed"
+    ),
+    "billing_dispute": (
+        "wrong charge", "incorrect bill", "didn't authorize", "dispute charge",
+        "billing error", "overcharged", "double charged"
+    ),
+    "subscription_change": (
+        "upgrade", "downgrade", "change plan", "modify subscription",
+        "cancel subscription", "pause account"
+    ),
+    "refund_request": (
+        "refund", "money back", "return payment", "credit back",
+        "reimburse", "get my money"
+    ),
+    "invoice_inquiry": (
+        "invoice", "bill", "statement", "billing history",
+        "payment due", "balance"
+    ),
+    "payment_method": (
+        "update card", "change payment", "new credit card",
+        "payment method", "billing info"
+    ),
+    "account_access": (
+        "account suspended", "can't access", "locked out",
+        "account disabled", "service stopped"
+    )
+}
+
+def _index_phrases(groups: Dict[str, Tuple[str, ...]]) -> Dict[str, Tuple[str, ...]]:
+    """Map each phrase to the groups that list it"""
+    index: Dict[str, Tuple[str, ...]] = {}
+    for group, phrases in groups.items():
+        for phrase in phrases:
+            index[phrase] = index.get(phrase, ()) + (group,)
+    return index
+
+
+# Phrase -> inquiry types that list it
+_INQUIRY_PHRASE_TYPES = _index_phrases(INQUIRY_TYPES)
+
+# The lookahead lets matches overlap, and longest-first ordering reports the
+# longest phrase at each position; any shorter phrase found at the same
+# position is a prefix of it, so each match expands to its prefix phrases.
+_INQUIRY_PATTERN = re.compile(
+    "(?=(" + _keyword_pattern(_INQUIRY_PHRASE_TYPES).pattern + "))"
+)
+
+# Each distinct phrase owns one bit. A match sets the bits of its prefix
+# phrases, and a type's score is the popcount of the matched bits under its
+# mask, so scoring needs no per-message set or tally.
+_INQUIRY_PHRASE_BITS = {
+    phrase: 1 << bit for bit, phrase in enumerate(_INQUIRY_PHRASE_TYPES)
+}
+_INQUIRY_PREFIX_BITS = {
+    phrase: sum(
+        bit for other, bit in _INQUIRY_PHRASE_BITS.items() if phrase.startswith(other)
+    )
+    for phrase in _INQUIRY_PHRASE_TYPES
+}
+_INQUIRY_TYPE_MASKS = {
+    inq_type: sum(_INQUIRY_PHRASE_BITS[phrase] for phrase in set(phrases))
+    for inq_type, phrases in INQUIRY_TYPES.items()
+}
+
+# Urgency levels in the order they are checked; the first level with a
+# matching indicator wins
+URGENCY_INDICATORS = {
+    "high": (
+        "urgent", "immediately", "asap", "emergency", "critical",
+        "suspended", "locked", "can't access", "business down"
+    ),
+    "medium": (
+        "soon", "today", "this week", "important", "need help",
+        "overdue", "past due"
+    ),
+    "low": (
+        "when convenient", "no rush", "general question",
+        "wondering", "curious"
+    )
+}
+_URGENCY_PATTERNS = tuple(
+    (level, _keyword_pattern(indicators)) for level, indicators in URGENCY_INDICATORS.items()
+)
+
+# Signs of a billing problem that needs attention now, checked against
+# every turn of a high-priority conversation
+URGENT_BILLING_KEYWORDS = ("overdue", "suspended", "declined", "failed payment")
+_URGENT_BILLING_PATTERN = _keyword_pattern(URGENT_BILLING_KEYWORDS)
+
+# Common billing error patterns in disputes, in the order they are checked;
+# the first type with a matching phrase wins
+ERROR_PATTERNS = {
+    "double_charge": ("charged twice", "double charge", "billed twice", "duplicate charge"),
+    "wrong_amount": ("wrong amount", "incorrect charge", "overcharged", "too much"),
+    "unauthorized": ("didn't authorize", "never agreed", "unauthorized", "fraudulent"),
+    "cancelled_service": ("already cancelled", "stopped service", "cancelled subscription"),
+    "downgrade_issue": ("downgraded", "changed plan", "reduced service")
+}
+
+# Subscription changes, in the order they are checked
+MODIFICATION_TYPES = {
+    "upgrade": ("upgrade", "higher plan", "more features", "premium"),
+    "downgrade": ("downgrade", "lower plan", "cheaper", "reduce", "basic"),
+    "cancel": ("cancel", "close account", "terminate", "end subscription"),
+    "pause": ("pause", "suspend", "hold", "temporary stop")
+}
+
+
+def _compile_classifier(groups: Dict[str, Tuple[str, ...]], default: Optional[str] = None):
+    """Build a function returning the first group, in table order, with a
+    phrase in the text
+
+    One overlapping scan replaces a containment test per phrase. The scan
+    reports only the longest phrase starting at each position, so each
+    phrase is credited to the first group listing it or one of its prefixes.
+    Results are cached per text, since short requests like "cancel my
+    subscription" recur across conversations.
+    """
+    phrase_group = {
+        phrase: next(
+            group for group, others in groups.items()
+            if any(phrase.startswith(other) for other in others)
+        )
+        for phrases in groups.values() for phrase in phrases
+    }
+    find_phrases = re.compile(
+        "(?=(" + _keyword_pattern(phrase_group).pattern + "))"
+    ).finditer
+    priority = tuple(groups)
+    top_priority = priority[0]
+
+    def classify(text: str) -> Optional[str]:
+        matched = set()
+        for match in find_phrases(text):
+            group = phrase_group[match.group(1)]
+            if group == top_priority:
+                return group
+            matched.add(group)
+
+        for group in priority:
+            if group in matched:
+                return group
+        return default
+
+    return lru_cache(maxsize=256)(classify)
+
+
+# Refund reasons, in the order they are checked
+REFUND_REASONS = {
+    "service_issue": ("not working", "down", "outage", "broken", "problems"),
+    "billing_error": ("wrong charge", "error", "mistake", "incorrect"),
+    "dissatisfaction": ("unhappy", "disappointed", "not satisfied", "doesn't work"),
+    "cancellation": ("cancelled", "don't want", "no longer need"),
+    "duplicate_payment": ("charged twice", "double payment", "duplicate")
+}
+
+_classify_error_type = _compile_classifier(ERROR_PATTERNS)
+_classify_modification = _compile_classifier(MODIFICATION_TYPES, "general")
+_classify_refund_reason = _compile_classifier(REFUND_REASONS, "customer_request")
+
+# Response text for _resolve_payment_failure, assembled once at import
+_PAYMENT_RETRY_SUCCESS = (
+    "Great news! I was able to successfully process your payment. "
+    "Your account is now current and all services are active.\n\n"
+    "Payment Details:\n"
+    "• Amount: ${amount:.2f}\n"
+    "• Transaction ID: {transaction_id}\n"
+    "• Payment Method: {payment_method}\n\n"
+    "You'll receive a confirmation email shortly. Is there anything else I can help you with?"
+)
+_PAYMENT_DECLINED_NEXT_STEPS = (
+    "This typically means:\n"
+    "• Insufficient funds in your account\n"
+    "• Your card has expired or been replaced\n"
+    "• Your bank is blocking the transaction\n\n"
+    "I can help you update your payment method right now. "
+    "Would you like to add a new card or try a different payment option?"
+)
+_PAYMENT_RETRY_NEXT_STEPS = (
+    "Let me help you resolve this. I can:\n"
+    "• Update your payment method\n"
+    "• Try processing with a different card\n"
+    "• Set up a payment plan if needed\n\n"
+    "What would work best for you?"
+)
+_NO_PAYMENT_FAILURES = (
+    "I've checked your account and don't see any recent payment failures. "
+    "Your account appears to be in good standing. Could you provide more details "
+    "about the payment issue you're experiencing?"
+)
+
+# Response text for _investigate_billing_dispute
+_DISPUTE_CORRECTED = (
+    "I've reviewed your billing and you're absolutely right - there was an error. "
+    "I've immediately processed a credit adjustment of ${credit:.2f} "
+    "to your account.\n\n"
+    "Error Details:\n"
+    "• Issue: {description}\n"
+    "• Credit Amount: ${credit:.2f}\n"
+    "• Applied: Immediately\n\n"
+)
+_DISPUTE_CREDIT_NEXT_STEPS = (
+    "The credit will appear on your next statement, and if you've already paid, "
+    "we can process a refund instead. Would you prefer a refund or account credit?"
+)
+_DISPUTE_BALANCE_CORRECTED = (
+    "Your account balance has been corrected. I sincerely apologize for this error."
+)
+_DISPUTE_INVESTIGATION = (
+    "I understand your concern about this charge, and I want to make sure we get this resolved properly. "
+    "I've started a detailed investigation into your billing (Case #{case_id}).\n\n"
+    "What I'm investigating:\n"
+    "• {summary}\n"
+    "• Amount in question: ${amount:.2f}\n"
+    "• Billing period: {period}\n\n"
+    "I'll have a complete analysis within 2 business days. In the meantime, "
+    "I can place a temporary hold on this charge so it won't affect your account. "
+    "Would you like me to do that?"
+)
+
+# Response text for _modify_subscription and the subscription processors
+_SUBSCRIPTION_OVERVIEW = (
+    "I can help you with your subscription! Here's your current setup:\n\n"
+    "• Plan: {plan}\n"
+    "• Monthly Cost: ${monthly_cost:.2f}\n"
+    "• Next Billing: {next_billing}\n"
+    "• Status: {status}\n\n"
+    "I can help you:\n"
+    "• Upgrade to a higher plan with more features\n"
+    "• Downgrade to save money\n"
+    "• Pause your subscription temporarily\n"
+    "• Cancel if needed (with proper notice)\n\n"
+    "What would you like to do with your subscription?"
+)
+_NO_UPGRADES_AVAILABLE = (
+    "You're already on our highest tier plan! Your current {plan} "
+    "includes all our premium features. However, I can help you with add-ons or custom enterprise features "
+    "if you have specific needs. What additional capabilities are you looking for?"
+)
+_NO_DOWNGRADES_AVAILABLE = (
+    "You're currently on our most basic plan, so there aren't any lower-tier options available. "
+    "However, I can help you with:\n\n"
+    "• Pausing your subscription temporarily\n"
+    "• Switching to annual billing for a discount\n"
+    "• Exploring if there are any current promotions\n\n"
+    "What would work best for your situation?"
+)
+_PAUSE_INELIGIBLE = (
+    "I'm sorry, but your account isn't eligible for subscription pause due to: {reason}\n\n"
+    "However, I can offer these alternatives:\n"
+    "• Downgrade to a lower-cost plan temporarily\n"
+    "• Switch to annual billing for savings\n"
+    "• Explore special retention offers\n\n"
+    "What would work best for your situation?"
+)
+
+# Response text for _resolve_urgent_payment_failure and _process_refund_request
+_URGENT_PAYMENT_EXTENSION = (
+    "🚨 I understand this is urgent and affects your business operations. "
+    "I've immediately applied a 7-day service extension to keep your account active "
+    "while we resolve the payment issue.\n\n"
+    "Your services will remain fully functional during this period. "
+    "Now let's get your payment sorted out. I can:\n\n"
+    "• Process payment with a different card immediately\n"
+    "• Set up a payment plan if cash flow is an issue\n"
+    "• Connect you with our enterprise billing team for flexible options\n\n"
+    "What's the best way to resolve this for you right now?"
+)
+_REFUND_PROCESSED = (
+    "✅ Your refund has been approved and processed!\n\n"
+    "Refund Details:\n"
+    "• Amount: ${amount:.2f}\n"
+    "• Method: {method}\n"
+    "• Processing Time: {processing_time}\n"
+    "• Reference ID: {reference_id}\n\n"
+    "You'll receive an email confirmation shortly. Is there anything else I can help you with?"
+)
+_REFUND_PENDING_APPROVAL = (
+    "I can see you're eligible for a ${amount:.2f} refund. "
+    "Since this amount requires supervisor approval, I'm sending this to our billing manager for immediate review. "
+    "You'll receive approval and processing confirmation within 24 hours.\n\n"
+    "I've prioritized your request due to the amount involved. "
+    "Is there anything else I can help you with while this processes?"
+)
+_REFUND_SUPERVISOR_REVIEW = (
+    "I understand this may be disappointing. Let me connect you with our billing supervisor "
+    "who can review your specific circumstances and see if there are any exceptions that might apply."
+)
+
+# Response text for _update_payment_method
+_IDENTITY_VERIFICATION_REQUIRED = (
+    "For security purposes, I need to verify your identity before updating payment information. "
+    "I'm going to connect you with our secure billing line where you can safely update your payment method "
+    "after completing our standard verification process."
+)
+_PAYMENT_METHOD_OPTIONS = (
+    "\nI can help you:\n"
+    "• Add a new credit/debit card\n"
+    "• Update your existing card information\n"
+    "• Set up bank account (ACH) payments\n"
+    "• Add PayPal or other digital wallets\n\n"
+    "For security, I'll need to send you to our secure payment portal to enter the new information. "
+    "This ensures your financial data is protected with bank-level encryption.\n\n"
+    "Would you like me to generate a secure link for you to update your payment method?"
+)
+
+# Response text for _restore_account_access and _restore_urgent_account_access
+_ACCOUNT_NOT_SUSPENDED = (
+    "Good news! Your account is actually active and not suspended. "
+    "If you're having trouble accessing your account, this might be a technical issue or login problem. "
+    "Let me help you troubleshoot:\n\n"
+    "• Try clearing your browser cache and cookies\n"
+    "• Make sure you're using the correct login URL\n"
+    "• Check if you need to reset your password\n\n"
+    "Are you getting any specific error messages when trying to log in?"
+)
+_ACCOUNT_SUSPENDED = "I can see your account is currently suspended due to: {reason}\n\n"
+_SUSPENDED_PAYMENT_OPTIONS = (
+    "Outstanding Balance: ${balance:.2f}\n\n"
+    "To restore your account immediately, I can:\n"
+    "• Process payment for the outstanding balance\n"
+    "• Set up a payment plan if needed\n"
+    "• Update your payment method if that's the issue\n\n"
+    "Once payment is resolved, your account will be reactivated within minutes. "
+    "Would you like to take care of this now?"
+)
+_SUSPENDED_COMPLIANCE_REVIEW = (
+    "This type of suspension requires review by our compliance team. "
+    "Let me connect you with a supervisor who can review your case and work on getting "
+    "your account restored as quickly as possible."
+)
+_ACCOUNT_RESTORED = (
+    "Great news! I was able to restore your account access immediately. "
+    "Your account is now fully active and you should be able to log in normally.\n\n"
+    "Please try logging in again, and let me know if you encounter any issues."
+)
+_ACCOUNT_RESTORATION_FAILED = (
+    "I'm unable to automatically restore your account. Let me connect you with "
+    "our account restoration specialist who can manually review and reactivate your account."
+)
+_URGENT_RESTORATION_COMPLETED = (
+    "🚨 URGENT RESTORATION COMPLETED 🚨\n\n"
+    "Your account has been immediately reactivated with full access. "
+    "I understand this was business-critical, so I've:\n\n"
+    "• Restored all services immediately\n"
+    "• Applied a 72-hour grace period for any outstanding issues\n"
+    "• Flagged your account for priority support\n\n"
+    "{follow_up}"
+    "Your business operations should be fully restored now. Please confirm everything is working properly."
+)
+_URGENT_RESTORATION_FOLLOW_UP = (
+    "Important: Please resolve any outstanding billing matters within 72 hours "
+    "to prevent future interruptions. I'll have our billing team contact you today "
+    "to ensure everything stays resolved.\n\n"
+)
+_URGENT_ESCALATION = (
+    "🚨 URGENT ESCALATION 🚨\n\n"
+    "I understand this is a critical business issue. I'm immediately connecting you "
+    "with our emergency account restoration team. You'll be transferred within 30 seconds "
+    "to a specialist who has override authority to restore your access immediately.\n\n"
+    "Reference this conversation ID when you speak with them: "
+)
+
+# Response text for _provide_general_billing_support
+_BILLING_SUPPORT_INTRO = "I'm here to help with any billing questions you have! "
+_BILLING_SUPPORT_CLOSING = "What specific billing question can I answer for you today?"
+_BILLING_SUPPORT_MENU = (
+    _BILLING_SUPPORT_INTRO
+    + "I can see your account is in good standing. Here's what I can help you with:\n\n"
+    "💳 Billing & Payments:\n"
+    "• View your current balance and payment history\n"
+    "• Update payment methods securely\n"
+    "• Set up automatic payments\n"
+    "• Download invoices and tax documents\n\n"
+    "📋 Subscription Management:\n"
+    "• Upgrade or downgrade your plan\n"
+    "• Change billing cycles (monthly/annual)\n"
+    "• Add or remove features\n"
+    "• Pause or cancel subscriptions\n\n"
+    "💰 Refunds & Credits:\n"
+    "• Process eligible refunds\n"
+    "• Apply account credits\n"
+    "• Resolve billing disputes\n"
+    "• Explain charges and fees\n\n"
+    "🔒 Account Security:\n"
+    "• Update billing address\n"
+    "• Manage authorized users\n"
+    "• Review account access logs\n\n"
+    + _BILLING_SUPPORT_CLOSING
+)
+_BILLING_SERVICES_MENU = (
+    _BILLING_SUPPORT_INTRO
+    + "Here are the billing services I can help you with:\n\n"
+    "• Payment issues and failed transactions\n"
+    "• Subscription changes and upgrades\n"
+    "• Refund requests and billing disputes\n"
+    "• Invoice questions and payment history\n"
+    "• Account access and security issues\n\n"
+    + _BILLING_SUPPORT_CLOSING
+)
+
+# Response text for _provide_billing_information
+_BILLING_STATUS = (
+    "Here's your current billing information:\n\n"
+    "📊 Account Status:\n"
+    "• Balance: ${balance:.2f}\n"
+    "• Status: {status}\n"
+    "• Next billing date: {next_billing_date}\n\n"
+)
+_BILLING_SUBSCRIPTION = (
+    "💳 Current Subscription:\n"
+    "• Plan: {plan}\n"
+    "• Monthly cost: ${cost:.2f}\n"
+    "• Billing cycle: {cycle}\n\n"
+)
+_BILLING_PAYMENT_METHOD = (
+    "💳 Payment Method:\n"
+    "• Type: {type}\n"
+    "• Last 4 digits: {last_four}\n"
+    "• Expires: {expiry}\n\n"
+)
+_BILLING_INFO_CLOSING = (
+    "Need more details about any of these items? I can provide detailed breakdowns "
+    "or help with any billing questions you have!"
+)
+
+
+def _format_subscription(sub: Dict[str, Any]) -> str:
+    """Current subscription section of the billing information reply"""
+    return _BILLING_SUBSCRIPTION.format(
+        plan=sub.get('plan_name', 'N/A'),
+        cost=sub.get('monthly_cost', 0),
+        cycle=sub.get('billing_cycle', 'Monthly')
+    )
+
+
+def _format_transactions(transactions: List[Dict[str, Any]]) -> str:
+    """Recent transactions section, showing the latest three"""
+    return "".join((
+        "💰 Recent Transactions:\n",
+        *(
+            f"• {transaction.get('date', 'N/A')}: ${transaction.get('amount', 0):.2f} - {transaction.get('description', 'Payment')}\n"
+            for transaction in transactions[:3]
+        ),
+        "\n"
+    ))
+
+
+def _format_payment_method(payment: Dict[str, Any]) -> str:
+    """Payment method section of the billing information reply"""
+    return _BILLING_PAYMENT_METHOD.format(
+        type=payment.get('type', 'N/A'),
+        last_four=payment.get('last_four', 'N/A'),
+        expiry=payment.get('expiry', 'N/A')
+    )
+
+
+def _format_upcoming_charges(charges: List[Dict[str, Any]]) -> str:
+    """Upcoming charges section of the billing information reply"""
+    return "".join((
+        "📅 Upcoming Charges:\n",
+        *(
+            f"• {charge.get('date', 'N/A')}: ${charge.get('amount', 0):.2f} - {charge.get('description', 'Subscription')}\n"
+            for charge in charges
+        ),
+        "\n"
+    ))
+
+
+# Billing summary key -> formatter for its section of the reply
+_BILLING_SECTIONS = (
+    ("current_subscription", _format_subscription),
+    ("recent_transactions", _format_transactions),
+    ("payment_method", _format_payment_method),
+    ("upcoming_charges", _format_upcoming_charges),
+)
+
+# Error-path results for the payment, refund and account handlers. They are
+# constant apart from tools_used, so each except branch copies one and fills
+# that in; nothing downstream mutates the shared actions_taken lists.
+_REFUND_ERROR_RESULT: Dict[str, Any] = {
+    "message": "I want to make sure your refund request is handled properly. Let me connect you with our billing supervisor who can review your account and process any eligible refunds immediately.",
+    "confidence": 0.5,
+    "success": False,
+    "actions_taken": ["refund_processing_error"],
+    "outcome": "escalation_required",
+    "requires_escalation": True
+}
+_BILLING_INFO_ERROR_RESULT: Dict[str, Any] = {
+    "message": "I'm having trouble accessing your billing information right now. Let me connect you with our billing specialist who can provide you with a complete account summary and answer any billing questions you have.",
+    "confidence": 0.5,
+    "success": False,
+    "actions_taken": ["billing_info_retrieval_failed"],
+    "outcome": "escalation_required",
+    "requires_escalation": True
+}
+_PAYMENT_UPDATE_ERROR_RESULT: Dict[str, Any] = {
+    "message": "I want to make sure your payment information is updated securely. Let me connect you with our billing team who can safely process payment method changes and ensure your account continues without interruption.",
+    "confidence": 0.6,
+    "success": False,
+    "actions_taken": ["payment_update_failed"],
+    "outcome": "secure_escalation_required",
+    "requires_escalation": True
+}
+_RESTORE_ERROR_RESULT: Dict[str, Any] = {
+    "message": "I understand you need to regain access to your account urgently. Let me connect you immediately with our account restoration team who can resolve this and get you back up and running.",
+    "confidence": 0.5,
+    "success": False,
+    "actions_taken": ["account_restoration_error"],
+    "outcome": "urgent_escalation_required",
+    "requires_escalation": True
+}
+_URGENT_RESTORE_ERROR_RESULT: Dict[str, Any] = {
+    "message": "🚨 CRITICAL ISSUE 🚨 I'm immediately transferring you to our emergency response team. They will call you within 2 minutes to restore your access. Please stay on the line.",
+    "confidence": 0.7,
+    "success": False,
+    "actions_taken": ["critical_escalation"],
+    "outcome": "critical_escalation_required",
+    "requires_escalation": True,
+    "priority_escalation": True
+}
+
 
 class BillingAgent(BaseAgent):
     """Agent specialized in billing, payments, subscriptions, and account management"""
     
+    # BaseAgent declares slots for the shared attributes; declaring the rest
+    # here means billing agents carry no per-instance __dict__
+    __slots__ = (
+        "billing_policies",
+        "payment_rules",
+        "subscription_workflows",
+        "refund_policies",
+        "dispute_procedures",
+        "account_actions",
+        "_action_methods",
+        "_tool_results",
+        "_refund_approval_limit",
+        "_refund_processing_times",
+    )
+    
+    _PERMISSIONS: Tuple[str, ...] = (
+        "read_customer_billing_data",
+        "view_payment_history",
+        "process_refunds",
+        "update_payment_methods",
+        "modify_subscriptions",
+        "apply_credits",
+        "generate_invoices",
+        "access_billing_system",
+        "process_chargebacks",
+        "adjust_billing_cycles",
+        "apply_billing_adjustments",
+        "access_payment_gateway",
+    )
+    
     def __init__(
         self,
         name: str,
@@ -27,6 +677,9 @@ class BillingAgent(BaseAgent):
     ):
         super().__init__(name, model, capabilities, tools, confidence_threshold)
         
+        # The policy tables below are static config: each _initialize_* builds
+        # its table once and every BillingAgent shares it read-only
+        
         # Billing policies and procedures
         self.billing_policies = self._initialize_billing_policies()
         
@@ -38,17 +691,73 @@ class BillingAgent(BaseAgent):
         
         # Refund and credit policies
         self.refund_policies = self._initialize_refund_policies()
+        self._refund_approval_limit = self.refund_policies["approval_limits"]["billing_agent"]
+        self._refund_processing_times = self.refund_policies["processing_times"]
         
         # Billing dispute resolution procedures
         self.dispute_procedures = self._initialize_dispute_procedures()
         
         # Account management actions
         self.account_actions = self._initialize_account_actions()
+        
+        # Billing action -> resolver, bound once rather than per message
+        self._action_methods = {
+            "resolve_payment_failure": self._resolve_payment_failure,
+            "urgent_resolve_payment_failure": self._resolve_urgent_payment_failure,
+            "investigate_dispute": self._investigate_billing_dispute,
+            "modify_subscription": self._modify_subscription,
+            "process_refund": self._process_refund_request,
+            "provide_billing_info": self._provide_billing_information,
+            "update_payment_method": self._update_payment_method,
+            "restore_account_access": self._restore_account_access,
+            "urgent_restore_account_access": self._restore_urgent_account_access,
+            "provide_billing_support": self._provide_general_billing_support
+        }
+        
+        # (tool name, customer id) -> task for a recent read-only lookup
+        self._tool_results: TTLCache = TTLCache(maxsize=1024, ttl=30)
+    
+    def use_tool(
+        self,
+        tool_name: str,
+        parameters: Dict[str, Any],
+        agent_context: Dict[str, Any]
+    ) -> Awaitable[Dict[str, Any]]:
+        """Execute a tool, reusing a customer's recent read-only lookups
+
+        Concurrent identical lookups share one in-flight call. Any other tool
+        called for the customer may change what those lookups return, so it
+        drops the customer's cached results first. Every call is bounded by
+        the tool's entry in _TOOL_TIMEOUTS.
+        """
+        timeout = _TOOL_TIMEOUTS.get(tool_name, _DEFAULT_TOOL_TIMEOUT)
+        customer_id = parameters.get("customer_id")
+        if customer_id is None:
+            return asyncio.wait_for(super().use_tool(tool_name, parameters, agent_context), timeout)
+        
+        if tool_name not in _CACHEABLE_TOOLS:
+            for cached_tool in _CACHEABLE_TOOLS:
+                self._tool_results.pop((cached_tool, customer_id), None)
+            return asyncio.wait_for(super().use_tool(tool_name, parameters, agent_context), timeout)
+        
+        key = (tool_name, customer_id)
+        result = self._tool_results.get(key)
+        if result is None:
+            result = asyncio.ensure_future(super().use_tool(tool_name, parameters, agent_context))
+            result.add_done_callback(partial(_forget_failed_result, self._tool_results, key))
+            self._tool_results[key] = result
+        # Shielded so one caller being cancelled or timing out doesn't cancel
+        # the shared call
+        return asyncio.wait_for(asyncio.shield(result), timeout)
     
     async def handle_message(self, message: str, state: AgentState) -> Dict[str, Any]:
         """Handle billing-related inquiries and issues"""
         try:
-            logger.info(f"Billing agent handling inquiry for conversation {state.conversation_id}")
+            logger.info("Billing agent handling inquiry", conversation_id=state.conversation_id)
+            
+            # Resolved once and passed to every resolver and tool call
+            agent_context = self.get_agent_context(state)
+            customer_id = agent_context["customer_id"]
             
             # Analyze billing inquiry type
             billing_analysis = await self._analyze_billing_inquiry(message, state)
@@ -56,14 +765,15 @@ class BillingAgent(BaseAgent):
             # Determine billing action required
             billing_action = await self._determine_billing_action(message, state, billing_analysis)
             
-            # Execute billing resolution
-            response = await self._execute_billing_resolution(billing_action, message, state)
-            
-            # Check for account alerts or issues
-            account_alerts = await self._check_account_alerts(state)
+            # Execute billing resolution and check for account alerts or
+            # issues; the alert check doesn't depend on the resolution
+            response, account_alerts = await asyncio.gather(
+                self._execute_billing_resolution(billing_action, message, state, customer_id, agent_context),
+                self._check_account_alerts(state, customer_id, agent_context)
+            )
             
             # Update billing history
-            await self._update_billing_interaction_history(billing_analysis, response, state)
+            await self._update_billing_interaction_history(billing_analysis, response, state, customer_id)
             
             return {
                 "message": response["message"],
@@ -85,7 +795,7 @@ class BillingAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Billing agent error: {e}")
+            logger.exception("Billing agent error")
             return {
                 "message": "I apologize for the technical difficulty with your billing inquiry. Let me connect you with our billing specialist who can access your account and resolve this issue immediately.",
                 "confidence": 0.0,
@@ -98,61 +808,40 @@ class BillingAgent(BaseAgent):
                 "error": str(e)
             }
     
-    async def can_handle(self, state: AgentState) -> bool:
+    def can_handle(self, state: AgentState) -> bool:
         """Determine if this agent can handle the current billing inquiry"""
-        # Billing-related intents
-        billing_intents = [
-            "billing_inquiry", "payment_issue", "subscription_change", "refund_request",
-            "invoice_question", "account_balance", "payment_method_update", "billing_dispute",
-            "subscription_cancel", "upgrade_billing", "downgrade_billing", "credit_inquiry"
-        ]
+        # Checks run cheapest first and stop at the first match
         
         # Check if intent is billing-related
-        can_handle_intent = (
-            state.current_intent in billing_intents or
-            any(keyword in state.current_intent.lower() 
-                for keyword in ["billing", "payment", "invoice", "subscription", "refund", "charge"])
-        )
+        current_intent = state.current_intent
+        if current_intent in BILLING_INTENTS:
+            return True
+        intent_lower = current_intent.lower()
+        if any(keyword in intent_lower for keyword in BILLING_INTENT_KEYWORDS):
+            return True
         
         # Check for billing keywords in recent conversation
-        billing_keywords_present = False
-        if state.conversation_history:
-            recent_messages = [turn.message.lower() for turn in state.conversation_history[-3:]]
-            billing_keywords = [
-                "bill", "payment", "charge", "invoice", "subscription", "refund", "credit",
-                "balance", "card", "bank", "account", "fee", "cost", "price", "money"
-            ]
-            billing_keywords_present = any(
-                keyword in message for message in recent_messages for keyword in billing_keywords
-            )
+        history = state.conversation_history
+        if not history:
+            return False
+        search_keywords = _BILLING_KEYWORD_PATTERN.search
+        if any(search_keywords(_lowercase(turn.message)) for turn in history[-3:]):
+            return True
         
         # Check for urgent billing issues
-        urgent_billing = (
+        return (
             state.priority == Priority.HIGH and
-            any(keyword in str(state.conversation_history).lower() 
-                for keyword in ["overdue", "suspended", "declined", "failed payment"])
+            any(_URGENT_BILLING_PATTERN.search(_lowercase(turn.message))
+                for turn in history)
         )
-        
-        return can_handle_intent or billing_keywords_present or urgent_billing
     
-    def _get_agent_permissions(self) -> List[str]:
+    def _get_agent_permissions(self) -> Tuple[str, ...]:
         """Get the permissions available to this agent"""
-        return [
-            "read_customer_billing_data",
-            "view_payment_history",
-            "process_refunds",
-            "update_payment_methods",
-            "modify_subscriptions",
-            "apply_credits",
-            "generate_invoices",
-            "access_billing_system",
-            "process_chargebacks",
-            "adjust_billing_cycles",
-            "apply_billing_adjustments",
-            "access_payment_gateway"
-        ]
+        return self._PERMISSIONS
     
-    def _initialize_billing_policies(self) -> Dict[str, Dict[str, Any]]:
+    @staticmethod
+    @cache
+    def _initialize_billing_policies() -> Dict[str, Dict[str, Any]]:
         """Initialize billing policies and procedures"""
         return {
             "payment_terms": {
@@ -182,19 +871,21 @@ class BillingAgent(BaseAgent):
             }
         }
     
-    def _initialize_payment_rules(self) -> Dict[str, Dict[str, Any]]:
+    @staticmethod
+    @cache
+    def _initialize_payment_rules() -> Dict[str, Dict[str, Any]]:
         """Initialize payment processing rules"""
         return {
             "accepted_methods": {
-                "credit_cards": ["visa", "mastercard", "amex", "discover"],
-                "bank_transfers": ["ach", "wire"],
-                "digital_wallets": ["paypal", "stripe"],
-                "corporate": ["purchase_order", "invoice"]
+                "credit_cards": ("visa", "mastercard", "amex", "discover"),
+                "bank_transfers": ("ach", "wire"),
+                "digital_wallets": ("paypal", "stripe"),
+                "corporate": ("purchase_order", "invoice")
             },
             "retry_logic": {
                 "failed_payment_retries": 3,
-                "retry_intervals": [1, 3, 7],  # days
-                "notification_schedule": [1, 7, 14, 30]
+                "retry_intervals": (1, 3, 7),  # days
+                "notification_schedule": (1, 7, 14, 30)
             },
             "fraud_prevention": {
                 "velocity_checks": True,
@@ -209,47 +900,51 @@ class BillingAgent(BaseAgent):
             }
         }
     
-    def _initialize_subscription_workflows(self) -> Dict[str, List[str]]:
+    @staticmethod
+    @cache
+    def _initialize_subscription_workflows() -> Dict[str, Tuple[str, ...]]:
         """Initialize subscription management workflows"""
         return {
-            "upgrade": [
+            "upgrade": (
                 "verify_current_subscription",
                 "calculate_prorated_charges",
                 "process_upgrade_payment",
                 "activate_new_features",
                 "send_confirmation"
-            ],
-            "downgrade": [
+            ),
+            "downgrade": (
                 "verify_current_subscription",
                 "check_usage_limits",
                 "calculate_credit_amount",
                 "schedule_downgrade_date",
                 "notify_feature_changes"
-            ],
-            "cancellation": [
+            ),
+            "cancellation": (
                 "verify_account_owner",
                 "check_outstanding_balance",
                 "process_final_billing",
                 "schedule_service_termination",
                 "export_data_backup"
-            ],
-            "suspension": [
+            ),
+            "suspension": (
                 "verify_suspension_reason",
                 "backup_account_data",
                 "disable_service_access",
                 "send_suspension_notice",
                 "set_reactivation_conditions"
-            ],
-            "reactivation": [
+            ),
+            "reactivation": (
                 "verify_payment_method",
                 "process_outstanding_balance",
                 "restore_service_access",
                 "validate_account_settings",
                 "send_welcome_back_notice"
-            ]
+            )
         }
     
-    def _initialize_refund_policies(self) -> Dict[str, Dict[str, Any]]:
+    @staticmethod
+    @cache
+    def _initialize_refund_policies() -> Dict[str, Dict[str, Any]]:
         """Initialize refund and credit policies"""
         return {
             "eligibility_criteria": {
@@ -265,7 +960,7 @@ class BillingAgent(BaseAgent):
                 "dissatisfaction": {
                     "window": 30,  # days
                     "refund_percentage": 100,
-                    "conditions": ["first_time_user", "minimal_usage"]
+                    "conditions": ("first_time_user", "minimal_usage")
                 },
                 "downgrade": {
                     "refund_percentage": "prorated",
@@ -286,33 +981,37 @@ class BillingAgent(BaseAgent):
             }
         }
     
-    def _initialize_dispute_procedures(self) -> Dict[str, List[str]]:
+    @staticmethod
+    @cache
+    def _initialize_dispute_procedures() -> Dict[str, Tuple[str, ...]]:
         """Initialize billing dispute resolution procedures"""
         return {
-            "chargeback_process": [
+            "chargeback_process": (
                 "receive_chargeback_notification",
                 "gather_transaction_evidence",
                 "compile_dispute_package",
                 "submit_representment",
                 "monitor_case_status"
-            ],
-            "billing_dispute": [
+            ),
+            "billing_dispute": (
                 "log_dispute_details",
                 "investigate_billing_records",
                 "verify_service_delivery",
                 "calculate_adjustments",
                 "communicate_resolution"
-            ],
-            "fraud_investigation": [
+            ),
+            "fraud_investigation": (
                 "freeze_suspicious_activity",
                 "collect_security_evidence",
                 "verify_account_ownership",
                 "assess_financial_impact",
                 "implement_security_measures"
-            ]
+            )
         }
     
-    def _initialize_account_actions(self) -> Dict[str, Dict[str, Any]]:
+    @staticmethod
+    @cache
+    def _initialize_account_actions() -> Dict[str, Dict[str, Any]]:
         """Initialize account management actions"""
         return {
             "payment_update": {
@@ -345,71 +1044,34 @@ class BillingAgent(BaseAgent):
     
     async def _analyze_billing_inquiry(self, message: str, state: AgentState) -> Dict[str, Any]:
         """Analyze the type and urgency of billing inquiry"""
-        message_lower = message.lower()
+        message_lower = _lowercase(message)
         
-        # Inquiry type classification
-        inquiry_types = {
-            "payment_failure": [
-                "payment failed", "card declined", "payment error", "couldn't charge",
-                "payment unsuccessful", "transaction failed"
-            ],
-            "billing_dispute": [
-                "wrong charge", "incorrect bill", "didn't authorize", "dispute charge",
-                "billing error", "overcharged", "double charged"
-            ],
-            "subscription_change": [
-                "upgrade", "downgrade", "change plan", "modify subscription",
-                "cancel subscription", "pause account"
-            ],
-            "refund_request": [
-                "refund", "money back", "return payment", "credit back",
-                "reimburse", "get my money"
-            ],
-            "invoice_inquiry": [
-                "invoice", "bill", "statement", "billing history",
-                "payment due", "balance"
-            ],
-            "payment_method": [
-                "update card", "change payment", "new credit card",
-                "payment method", "billing info"
-            ],
-            "account_access": [
-                "account suspended", "can't access", "locked out",
-                "account disabled", "service stopped"
-            ]
-        }
+        # Inquiry type classification: one overlapping scan collects every
+        # distinct phrase in the message as a bitmask, then each type is
+        # scored by the share of its phrases that matched
+        matched_bits = 0
+        for match in _INQUIRY_PATTERN.finditer(message_lower):
+            matched_bits |= _INQUIRY_PREFIX_BITS[match.group(1)]
         
         # Determine inquiry type
         inquiry_type = "general_billing"
         confidence = 0.0
         
-        for inq_type, keywords in inquiry_types.items():
-            matches = sum(1 for keyword in keywords if keyword in message_lower)
+        for inq_type, keywords in INQUIRY_TYPES.items() if matched_bits else ():
+            matches = (matched_bits & _INQUIRY_TYPE_MASKS[inq_type]).bit_count()
             if matches > 0:
                 current_confidence = matches / len(keywords)
                 if current_confidence > confidence:
                     inquiry_type = inq_type
                     confidence = current_confidence
+                    # Every phrase matched; no later type can score higher
+                    if matches == len(keywords):
+                        break
         
         # Urgency assessment
-        urgency_indicators = {
-            "high": [
-                "urgent", "immediately", "asap", "emergency", "critical",
-                "suspended", "locked", "can't access", "business down"
-            ],
-            "medium": [
-                "soon", "today", "this week", "important", "need help",
-                "overdue", "past due"
-            ],
-            "low": [
-                "when convenient", "no rush", "general question",
-                "wondering", "curious"
-            ]
-        }
-        
         urgency = "medium"  # default
-        for level, indicators in urgency_indicators.items():
-            if any(indicator in message_lower for indicator in indicators):
+        for level, indicators in _URGENCY_PATTERNS:
+            if indicators.search(message_lower):
                 urgency = level
                 break
         
@@ -421,19 +1083,21 @@ class BillingAgent(BaseAgent):
             "confidence": confidence,
             "urgency": urgency,
             "financial_impact": financial_impact,
-            "requires_verification": inquiry_type in ["payment_method", "refund_request", "subscription_change"],
+            "requires_verification": inquiry_type in ("payment_method", "refund_request", "subscription_change"),
             "potential_escalation": urgency == "high" or financial_impact > 1000
         }
     
     def _assess_financial_impact(self, message_lower: str, state: AgentState) -> float:
         """Assess the potential financial impact of the inquiry"""
-        # Extract monetary amounts from message
-        amount_pattern = r'\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'
-        amounts = re.findall(amount_pattern, message_lower)
+        # Take the largest monetary amount mentioned in the message
+        largest_amount = None
+        for match in _AMOUNT_PATTERN.finditer(message_lower):
+            amount = float(match.group(1).replace(',', ''))
+            if largest_amount is None or amount > largest_amount:
+                largest_amount = amount
         
-        if amounts:
-            # Take the largest amount mentioned
-            return max(float(amount.replace(',', '')) for amount in amounts)
+        if largest_amount is not None:
+            return largest_amount
         
         # Estimate based on customer tier and inquiry type
         if state.customer:
@@ -473,7 +1137,7 @@ class BillingAgent(BaseAgent):
         
         # Modify action based on urgency
         if urgency == "high":
-            if base_action in ["resolve_payment_failure", "restore_account_access"]:
+            if base_action in ("resolve_payment_failure", "restore_account_access"):
                 return f"urgent_{base_action}"
         
         return base_action
@@ -482,27 +1146,15 @@ class BillingAgent(BaseAgent):
         self, 
         action: str, 
         message: str, 
-        state: AgentState
+        state: AgentState,
+        customer_id: Optional[str],
+        agent_context: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Execute the billing resolution action"""
-        
-        action_methods = {
-            "resolve_payment_failure": self._resolve_payment_failure,
-            "urgent_resolve_payment_failure": self._resolve_urgent_payment_failure,
-            "investigate_dispute": self._investigate_billing_dispute,
-            "modify_subscription": self._modify_subscription,
-            "process_refund": self._process_refund_request,
-            "provide_billing_info": self._provide_billing_information,
-            "update_payment_method": self._update_payment_method,
-            "restore_account_access": self._restore_account_access,
-            "urgent_restore_account_access": self._restore_urgent_account_access,
-            "provide_billing_support": self._provide_general_billing_support
-        }
-        
-        method = action_methods.get(action, self._provide_general_billing_support)
-        return await method(message, state)
+        method = self._action_methods.get(action, self._provide_general_billing_support)
+        return await method(message, state, customer_id, agent_context)
     
-    async def _resolve_payment_failure(self, message: str, state: AgentState) -> Dict[str, Any]:
+    async def _resolve_payment_failure(self, message: str, state: AgentState, customer_id: Optional[str], agent_context: Dict[str, Any]) -> Dict[str, Any]:
         """Resolve payment failure issues"""
         tools_used = []
         
@@ -510,8 +1162,8 @@ class BillingAgent(BaseAgent):
             # Get payment history and current status
             payment_status = await self.use_tool(
                 "get_payment_status",
-                {"customer_id": state.customer.customer_id if state.customer else None},
-                self.get_agent_context(state)
+                {"customer_id": customer_id},
+                agent_context
             )
             tools_used.append("get_payment_status")
             
@@ -526,22 +1178,20 @@ class BillingAgent(BaseAgent):
                     retry_result = await self.use_tool(
                         "retry_payment",
                         {
-                            "customer_id": state.customer.customer_id if state.customer else None,
+                            "customer_id": customer_id,
                             "payment_id": latest_failure.get("payment_id"),
                             "retry_reason": "customer_request"
                         },
-                        self.get_agent_context(state)
+                        agent_context
                     )
                     tools_used.append("retry_payment")
                     
                     if retry_result.get("success"):
-                        response = f"Great news! I was able to successfully process your payment. "
-                        response += f"Your account is now current and all services are active.\n\n"
-                        response += f"Payment Details:\n"
-                        response += f"• Amount: ${retry_result.get('amount', 0):.2f}\n"
-                        response += f"• Transaction ID: {retry_result.get('transaction_id', 'N/A')}\n"
-                        response += f"• Payment Method: {retry_result.get('payment_method', 'N/A')}\n\n"
-                        response += f"You'll receive a confirmation email shortly. Is there anything else I can help you with?"
+                        response = _PAYMENT_RETRY_SUCCESS.format(
+                            amount=retry_result.get('amount', 0),
+                            transaction_id=retry_result.get('transaction_id', 'N/A'),
+                            payment_method=retry_result.get('payment_method', 'N/A')
+                        )
                         
                         return {
                             "message": response,
@@ -554,22 +1204,15 @@ class BillingAgent(BaseAgent):
                         }
                     else:
                         # Payment retry failed, offer alternatives
-                        response = f"I see there's still an issue with your payment method. "
-                        response += f"The error is: {failure_reason}\n\n"
-                        
-                        if failure_reason in ["insufficient_funds", "card_declined"]:
-                            response += f"This typically means:\n"
-                            response += f"• Insufficient funds in your account\n"
-                            response += f"• Your card has expired or been replaced\n"
-                            response += f"• Your bank is blocking the transaction\n\n"
-                            response += f"I can help you update your payment method right now. "
-                            response += f"Would you like to add a new card or try a different payment option?"
+                        if failure_reason in ("insufficient_funds", "card_declined"):
+                            next_steps = _PAYMENT_DECLINED_NEXT_STEPS
                         else:
-                            response += f"Let me help you resolve this. I can:\n"
-                            response += f"• Update your payment method\n"
-                            response += f"• Try processing with a different card\n"
-                            response += f"• Set up a payment plan if needed\n\n"
-                            response += f"What would work best for you?"
+                            next_steps = _PAYMENT_RETRY_NEXT_STEPS
+                        response = "".join((
+                            "I see there's still an issue with your payment method. ",
+                            f"The error is: {failure_reason}\n\n",
+                            next_steps
+                        ))
                         
                         return {
                             "message": response,
@@ -581,12 +1224,8 @@ class BillingAgent(BaseAgent):
                             "follow_up_required": True
                         }
                 else:
-                    response = "I've checked your account and don't see any recent payment failures. "
-                    response += "Your account appears to be in good standing. Could you provide more details "
-                    response += "about the payment issue you're experiencing?"
-                    
                     return {
-                        "message": response,
+                        "message": _NO_PAYMENT_FAILURES,
                         "confidence": 0.7,
                         "success": True,
                         "actions_taken": ["account_status_verified"],
@@ -596,8 +1235,8 @@ class BillingAgent(BaseAgent):
             else:
                 raise Exception("Unable to retrieve payment status")
                 
-        except Exception as e:
-            logger.error(f"Payment failure resolution failed: {e}")
+        except Exception:
+            logger.exception("Payment failure resolution failed")
             return {
                 "message": "I'm having trouble accessing your payment information right now. Let me connect you with our billing specialist who can resolve this payment issue immediately and ensure your account stays active.",
                 "confidence": 0.5,
@@ -608,7 +1247,7 @@ class BillingAgent(BaseAgent):
                 "requires_escalation": True
             }
     
-    async def _resolve_urgent_payment_failure(self, message: str, state: AgentState) -> Dict[str, Any]:
+    async def _resolve_urgent_payment_failure(self, message: str, state: AgentState, customer_id: Optional[str], agent_context: Dict[str, Any]) -> Dict[str, Any]:
         """Resolve urgent payment failures that may affect service"""
         tools_used = []
         
@@ -616,8 +1255,8 @@ class BillingAgent(BaseAgent):
             # Check account suspension status
             account_status = await self.use_tool(
                 "get_account_status",
-                {"customer_id": state.customer.customer_id if state.customer else None},
-                self.get_agent_context(state)
+                {"customer_id": customer_id},
+                agent_context
             )
             tools_used.append("get_account_status")
             
@@ -626,26 +1265,16 @@ class BillingAgent(BaseAgent):
                 extension_result = await self.use_tool(
                     "apply_service_extension",
                     {
-                        "customer_id": state.customer.customer_id if state.customer else None,
+                        "customer_id": customer_id,
                         "extension_days": 7,
                         "reason": "payment_resolution_in_progress"
                     },
-                    self.get_agent_context(state)
+                    agent_context
                 )
                 tools_used.append("apply_service_extension")
                 
-                response = "🚨 I understand this is urgent and affects your business operations. "
-                response += "I've immediately applied a 7-day service extension to keep your account active "
-                response += "while we resolve the payment issue.\n\n"
-                response += "Your services will remain fully functional during this period. "
-                response += "Now let's get your payment sorted out. I can:\n\n"
-                response += "• Process payment with a different card immediately\n"
-                response += "• Set up a payment plan if cash flow is an issue\n"
-                response += "• Connect you with our enterprise billing team for flexible options\n\n"
-                response += "What's the best way to resolve this for you right now?"
-                
                 return {
-                    "message": response,
+                    "message": _URGENT_PAYMENT_EXTENSION,
                     "confidence": 0.9,
                     "success": True,
                     "actions_taken": ["service_extension_applied", "urgent_payment_assistance"],
@@ -656,10 +1285,10 @@ class BillingAgent(BaseAgent):
                 }
             else:
                 # Account not at risk, proceed with standard resolution
-                return await self._resolve_payment_failure(message, state)
+                return await self._resolve_payment_failure(message, state, customer_id, agent_context)
                 
-        except Exception as e:
-            logger.error(f"Urgent payment failure resolution failed: {e}")
+        except Exception:
+            logger.exception("Urgent payment failure resolution failed")
             return {
                 "message": "This is a critical billing issue affecting your service. I'm immediately connecting you with our emergency billing team who can resolve this within minutes and ensure your business operations continue uninterrupted.",
                 "confidence": 0.6,
@@ -671,7 +1300,7 @@ class BillingAgent(BaseAgent):
                 "priority_escalation": True
             }
     
-    async def _investigate_billing_dispute(self, message: str, state: AgentState) -> Dict[str, Any]:
+    async def _investigate_billing_dispute(self, message: str, state: AgentState, customer_id: Optional[str], agent_context: Dict[str, Any]) -> Dict[str, Any]:
         """Investigate billing disputes and discrepancies"""
         tools_used = []
         
@@ -680,11 +1309,11 @@ class BillingAgent(BaseAgent):
             billing_history = await self.use_tool(
                 "get_billing_history",
                 {
-                    "customer_id": state.customer.customer_id if state.customer else None,
+                    "customer_id": customer_id,
                     "include_details": True,
                     "period": "last_6_months"
                 },
-                self.get_agent_context(state)
+                agent_context
             )
             tools_used.append("get_billing_history")
             
@@ -697,28 +1326,23 @@ class BillingAgent(BaseAgent):
                     adjustment_result = await self.use_tool(
                         "process_billing_adjustment",
                         {
-                            "customer_id": state.customer.customer_id if state.customer else None,
+                            "customer_id": customer_id,
                             "adjustment_amount": -abs(dispute_analysis["error_amount"]),
                             "reason": "billing_error_correction",
                             "description": dispute_analysis["error_description"]
                         },
-                        self.get_agent_context(state)
+                        agent_context
                     )
                     tools_used.append("process_billing_adjustment")
                     
-                    response = f"I've reviewed your billing and you're absolutely right - there was an error. "
-                    response += f"I've immediately processed a credit adjustment of ${abs(dispute_analysis['error_amount']):.2f} "
-                    response += f"to your account.\n\n"
-                    response += f"Error Details:\n"
-                    response += f"• Issue: {dispute_analysis['error_description']}\n"
-                    response += f"• Credit Amount: ${abs(dispute_analysis['error_amount']):.2f}\n"
-                    response += f"• Applied: Immediately\n\n"
-                    
                     if dispute_analysis["error_amount"] > 0:
-                        response += f"The credit will appear on your next statement, and if you've already paid, "
-                        response += f"we can process a refund instead. Would you prefer a refund or account credit?"
+                        next_steps = _DISPUTE_CREDIT_NEXT_STEPS
                     else:
-                        response += f"Your account balance has been corrected. I sincerely apologize for this error."
+                        next_steps = _DISPUTE_BALANCE_CORRECTED
+                    response = _DISPUTE_CORRECTED.format(
+                        credit=abs(dispute_analysis['error_amount']),
+                        description=dispute_analysis['error_description']
+                    ) + next_steps
                     
                     return {
                         "message": response,
@@ -735,23 +1359,20 @@ class BillingAgent(BaseAgent):
                     investigation_result = await self.use_tool(
                         "create_billing_investigation",
                         {
-                            "customer_id": state.customer.customer_id if state.customer else None,
+                            "customer_id": customer_id,
                             "dispute_details": dispute_analysis["dispute_summary"],
                             "priority": "high" if dispute_analysis["amount"] > 500 else "normal"
                         },
-                        self.get_agent_context(state)
+                        agent_context
                     )
                     tools_used.append("create_billing_investigation")
                     
-                    response = f"I understand your concern about this charge, and I want to make sure we get this resolved properly. "
-                    response += f"I've started a detailed investigation into your billing (Case #{investigation_result.get('case_id', 'BIL-' + str(datetime.now().timestamp())[:10])}).\n\n"
-                    response += f"What I'm investigating:\n"
-                    response += f"• {dispute_analysis['dispute_summary']}\n"
-                    response += f"• Amount in question: ${dispute_analysis['amount']:.2f}\n"
-                    response += f"• Billing period: {dispute_analysis.get('period', 'Recent')}\n\n"
-                    response += f"I'll have a complete analysis within 2 business days. In the meantime, "
-                    response += f"I can place a temporary hold on this charge so it won't affect your account. "
-                    response += f"Would you like me to do that?"
+                    response = _DISPUTE_INVESTIGATION.format(
+                        case_id=investigation_result.get('case_id') or _fallback_reference('BIL'),
+                        summary=dispute_analysis['dispute_summary'],
+                        amount=dispute_analysis['amount'],
+                        period=dispute_analysis.get('period', 'Recent')
+                    )
                     
                     return {
                         "message": response,
@@ -760,21 +1381,26 @@ class BillingAgent(BaseAgent):
                         "actions_taken": ["investigation_started"],
                         "tools_used": tools_used,
                         "outcome": "investigation_in_progress",
-                        "follow_up_date": (datetime.now() + timedelta(days=2)).isoformat(),
+                        "follow_up_date": _follow_up_iso(_DISPUTE_FOLLOW_UP_DELTA),
                         "documentation_required": True
                     }
             else:
                 # No valid dispute found
-                response = f"I've carefully reviewed your billing history and the charges appear to be accurate "
-                response += f"based on your service usage and subscription. Let me walk you through what I found:\n\n"
+                parts = [
+                    f"I've carefully reviewed your billing history and the charges appear to be accurate ",
+                    f"based on your service usage and subscription. Let me walk you through what I found:\n\n"
+                ]
                 
                 if billing_history.get("recent_charges"):
-                    response += f"Recent Charges:\n"
+                    parts.append(f"Recent Charges:\n")
                     for charge in billing_history["recent_charges"][:5]:  # Show last 5 charges
-                        response += f"• {charge.get('date', 'N/A')}: ${charge.get('amount', 0):.2f} - {charge.get('description', 'Service charge')}\n"
+                        parts.append(f"• {charge.get('date', 'N/A')}: ${charge.get('amount', 0):.2f} - {charge.get('description', 'Service charge')}\n")
                 
-                response += f"\nIf you have specific questions about any of these charges, I'm happy to explain them in detail. "
-                response += f"Is there a particular charge you'd like me to break down for you?"
+                parts.extend((
+                    f"\nIf you have specific questions about any of these charges, I'm happy to explain them in detail. ",
+                    f"Is there a particular charge you'd like me to break down for you?"
+                ))
+                response = "".join(parts)
                 
                 return {
                     "message": response,
@@ -786,8 +1412,8 @@ class BillingAgent(BaseAgent):
                     "follow_up_required": True
                 }
                 
-        except Exception as e:
-            logger.error(f"Billing dispute investigation failed: {e}")
+        except Exception:
+            logger.exception("Billing dispute investigation failed")
             return {
                 "message": "I want to make sure your billing concern is properly addressed. Let me connect you with our billing specialist who can do a thorough review of your account and resolve any discrepancies immediately.",
                 "confidence": 0.5,
@@ -800,28 +1426,14 @@ class BillingAgent(BaseAgent):
     
     def _analyze_dispute_claim(self, message: str, billing_history: Dict) -> Dict[str, Any]:
         """Analyze the customer's dispute claim"""
-        message_lower = message.lower()
+        message_lower = _lowercase(message)
         
         # Extract disputed amount
-        amount_pattern = r'\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'
-        amounts = re.findall(amount_pattern, message_lower)
-        disputed_amount = float(amounts[0].replace(',', '')) if amounts else 0.0
-        
-        # Common billing error patterns
-        error_patterns = {
-            "double_charge": ["charged twice", "double charge", "billed twice", "duplicate charge"],
-            "wrong_amount": ["wrong amount", "incorrect charge", "overcharged", "too much"],
-            "unauthorized": ["didn't authorize", "never agreed", "unauthorized", "fraudulent"],
-            "cancelled_service": ["already cancelled", "stopped service", "cancelled subscription"],
-            "downgrade_issue": ["downgraded", "changed plan", "reduced service"]
-        }
+        amount = _AMOUNT_PATTERN.search(message_lower)
+        disputed_amount = float(amount.group(1).replace(',', '')) if amount else 0.0
         
         # Check for error patterns
-        error_type = None
-        for pattern_type, keywords in error_patterns.items():
-            if any(keyword in message_lower for keyword in keywords):
-                error_type = pattern_type
-                break
+        error_type = _classify_error_type(message_lower)
         
         # Analyze billing history for potential errors
         clear_error = False
@@ -832,9 +1444,12 @@ class BillingAgent(BaseAgent):
             recent_charges = billing_history["recent_charges"]
             
             if error_type == "double_charge":
-                # Check for duplicate charges
-                charge_amounts = [charge.get("amount", 0) for charge in recent_charges]
-                if disputed_amount in charge_amounts and charge_amounts.count(disputed_amount) > 1:
+                # Check for duplicate charges, compared in whole cents so
+                # float rounding can't hide a match
+                charge_counts = Counter(
+                    round(float(charge.get("amount", 0)) * 100) for charge in recent_charges
+                )
+                if charge_counts[round(disputed_amount * 100)] > 1:
                     clear_error = True
                     error_amount = disputed_amount
                     error_description = "Duplicate charge detected"
@@ -842,10 +1457,9 @@ class BillingAgent(BaseAgent):
             elif error_type == "cancelled_service":
                 # Check if service was cancelled but still charged
                 if billing_history.get("cancellation_date"):
-                    cancellation_date = datetime.fromisoformat(billing_history["cancellation_date"])
+                    cancellation_date = _parse_date(billing_history["cancellation_date"])
                     for charge in recent_charges:
-                        charge_date = datetime.fromisoformat(charge.get("date", "2023-01-01"))
-                        if charge_date > cancellation_date:
+                        if _parse_date(charge.get("date", "2023-01-01")) > cancellation_date:
                             clear_error = True
                             error_amount = charge.get("amount", 0)
                             error_description = "Charge after cancellation date"
@@ -861,47 +1475,38 @@ class BillingAgent(BaseAgent):
             "error_type": error_type
         }
     
-    async def _modify_subscription(self, message: str, state: AgentState) -> Dict[str, Any]:
+    async def _modify_subscription(self, message: str, state: AgentState, customer_id: Optional[str], agent_context: Dict[str, Any]) -> Dict[str, Any]:
         """Handle subscription modifications"""
         tools_used = []
         
+        # Determine modification type; it only depends on the message
+        modification_type = self._determine_modification_type(message)
+        
         try:
             # Get current subscription details
             subscription_info = await self.use_tool(
                 "get_subscription_details",
-                {"customer_id": state.customer.customer_id if state.customer else None},
-                self.get_agent_context(state)
+                {"customer_id": customer_id},
+                agent_context
             )
             tools_used.append("get_subscription_details")
             
-            # Determine modification type
-            modification_type = self._determine_modification_type(message)
-            
             if modification_type == "upgrade":
-                return await self._process_subscription_upgrade(message, state, subscription_info, tools_used)
+                return await self._process_subscription_upgrade(message, state, customer_id, agent_context, subscription_info, tools_used)
             elif modification_type == "downgrade":
-                return await self._process_subscription_downgrade(message, state, subscription_info, tools_used)
+                return await self._process_subscription_downgrade(message, state, customer_id, agent_context, subscription_info, tools_used)
             elif modification_type == "cancel":
-                return await self._process_subscription_cancellation(message, state, subscription_info, tools_used)
+                return await self._process_subscription_cancellation(message, state, customer_id, agent_context, subscription_info, tools_used)
             elif modification_type == "pause":
-                return await self._process_subscription_pause(message, state, subscription_info, tools_used)
+                return await self._process_subscription_pause(message, state, customer_id, agent_context, subscription_info, tools_used)
             else:
                 # General subscription inquiry
-                current_plan = subscription_info.get("plan_name", "Current Plan")
-                monthly_cost = subscription_info.get("monthly_cost", 0)
-                next_billing = subscription_info.get("next_billing_date", "Unknown")
-                
-                response = f"I can help you with your subscription! Here's your current setup:\n\n"
-                response += f"• Plan: {current_plan}\n"
-                response += f"• Monthly Cost: ${monthly_cost:.2f}\n"
-                response += f"• Next Billing: {next_billing}\n"
-                response += f"• Status: {subscription_info.get('status', 'Active')}\n\n"
-                response += f"I can help you:\n"
-                response += f"• Upgrade to a higher plan with more features\n"
-                response += f"• Downgrade to save money\n"
-                response += f"• Pause your subscription temporarily\n"
-                response += f"• Cancel if needed (with proper notice)\n\n"
-                response += f"What would you like to do with your subscription?"
+                response = _SUBSCRIPTION_OVERVIEW.format(
+                    plan=subscription_info.get("plan_name", "Current Plan"),
+                    monthly_cost=subscription_info.get("monthly_cost", 0),
+                    next_billing=subscription_info.get("next_billing_date", "Unknown"),
+                    status=subscription_info.get('status', 'Active')
+                )
                 
                 return {
                     "message": response,
@@ -913,8 +1518,8 @@ class BillingAgent(BaseAgent):
                     "follow_up_required": True
                 }
                 
-        except Exception as e:
-            logger.error(f"Subscription modification failed: {e}")
+        except Exception:
+            logger.exception("Subscription modification failed")
             return {
                 "message": "I'm having trouble accessing your subscription details right now. Let me connect you with our subscription specialist who can make any changes you need immediately.",
                 "confidence": 0.5,
@@ -927,44 +1532,40 @@ class BillingAgent(BaseAgent):
     
     def _determine_modification_type(self, message: str) -> str:
         """Determine what type of subscription modification is requested"""
-        message_lower = message.lower()
-        
-        if any(word in message_lower for word in ["upgrade", "higher plan", "more features", "premium"]):
-            return "upgrade"
-        elif any(word in message_lower for word in ["downgrade", "lower plan", "cheaper", "reduce", "basic"]):
-            return "downgrade"
-        elif any(word in message_lower for word in ["cancel", "close account", "terminate", "end subscription"]):
-            return "cancel"
-        elif any(word in message_lower for word in ["pause", "suspend", "hold", "temporary stop"]):
-            return "pause"
-        else:
-            return "general"
+        return _classify_modification(_lowercase(message))
     
-    async def _process_subscription_upgrade(self, message: str, state: AgentState, subscription_info: Dict, tools_used: List[str]) -> Dict[str, Any]:
+    async def _process_subscription_upgrade(self, message: str, state: AgentState, customer_id: Optional[str], agent_context: Dict[str, Any], subscription_info: Dict, tools_used: List[str]) -> Dict[str, Any]:
         """Process subscription upgrade"""
         try:
             # Get available upgrade options
             upgrade_options = await self.use_tool(
                 "get_upgrade_options",
                 {
-                    "customer_id": state.customer.customer_id if state.customer else None,
+                    "customer_id": customer_id,
                     "current_plan": subscription_info.get("plan_id")
                 },
-                self.get_agent_context(state)
+                agent_context
             )
             tools_used.append("get_upgrade_options")
             
             if upgrade_options.get("available_plans"):
-                response = f"Great! I can help you upgrade your subscription. Based on your current {subscription_info.get('plan_name', 'plan')}, "
-                response += f"here are your upgrade options:\n\n"
+                parts = [
+                    f"Great! I can help you upgrade your subscription. Based on your current {subscription_info.get('plan_name', 'plan')}, ",
+                    f"here are your upgrade options:\n\n"
+                ]
                 
                 for plan in upgrade_options["available_plans"]:
                     monthly_increase = plan.get("monthly_cost", 0) - subscription_info.get("monthly_cost", 0)
-                    response += f"• {plan.get('name', 'Plan')}: ${plan.get('monthly_cost', 0):.2f}/month (+${monthly_increase:.2f})\n"
-                    response += f"  New features: {', '.join(plan.get('new_features', [])[:3])}\n\n"
+                    parts.extend((
+                        f"• {plan.get('name', 'Plan')}: ${plan.get('monthly_cost', 0):.2f}/month (+${monthly_increase:.2f})\n",
+                        f"  New features: {', '.join(plan.get('new_features', [])[:3])}\n\n"
+                    ))
                 
-                response += f"I can process the upgrade immediately, and you'll only pay the prorated difference "
-                response += f"for this billing cycle. Which plan interests you most?"
+                parts.extend((
+                    f"I can process the upgrade immediately, and you'll only pay the prorated difference ",
+                    f"for this billing cycle. Which plan interests you most?"
+                ))
+                response = "".join(parts)
                 
                 return {
                     "message": response,
@@ -976,9 +1577,9 @@ class BillingAgent(BaseAgent):
                     "follow_up_required": True
                 }
             else:
-                response = f"You're already on our highest tier plan! Your current {subscription_info.get('plan_name', 'plan')} "
-                response += f"includes all our premium features. However, I can help you with add-ons or custom enterprise features "
-                response += f"if you have specific needs. What additional capabilities are you looking for?"
+                response = _NO_UPGRADES_AVAILABLE.format(
+                    plan=subscription_info.get('plan_name', 'plan')
+                )
                 
                 return {
                     "message": response,
@@ -989,8 +1590,8 @@ class BillingAgent(BaseAgent):
                     "outcome": "no_upgrades_available"
                 }
                 
-        except Exception as e:
-            logger.error(f"Subscription upgrade processing failed: {e}")
+        except Exception:
+            logger.exception("Subscription upgrade processing failed")
             return {
                 "message": "I'd be happy to help you upgrade your subscription! Let me connect you with our sales team who can show you all available options and process the upgrade with any applicable discounts.",
                 "confidence": 0.6,
@@ -1001,39 +1602,44 @@ class BillingAgent(BaseAgent):
                 "requires_escalation": True
             }
     
-    async def _process_subscription_downgrade(self, message: str, state: AgentState, subscription_info: Dict, tools_used: List[str]) -> Dict[str, Any]:
+    async def _process_subscription_downgrade(self, message: str, state: AgentState, customer_id: Optional[str], agent_context: Dict[str, Any], subscription_info: Dict, tools_used: List[str]) -> Dict[str, Any]:
         """Process subscription downgrade"""
         try:
             # Get downgrade options and impact analysis
             downgrade_options = await self.use_tool(
                 "get_downgrade_options",
                 {
-                    "customer_id": state.customer.customer_id if state.customer else None,
+                    "customer_id": customer_id,
                     "current_plan": subscription_info.get("plan_id")
                 },
-                self.get_agent_context(state)
+                agent_context
             )
             tools_used.append("get_downgrade_options")
             
             if downgrade_options.get("available_plans"):
-                response = f"I can help you downgrade to save money. Here are your options:\n\n"
+                parts = [f"I can help you downgrade to save money. Here are your options:\n\n"]
                 
                 for plan in downgrade_options["available_plans"]:
                     monthly_savings = subscription_info.get("monthly_cost", 0) - plan.get("monthly_cost", 0)
-                    response += f"• {plan.get('name', 'Plan')}: ${plan.get('monthly_cost', 0):.2f}/month (Save ${monthly_savings:.2f})\n"
+                    parts.append(f"• {plan.get('name', 'Plan')}: ${plan.get('monthly_cost', 0):.2f}/month (Save ${monthly_savings:.2f})\n")
                     
                     if plan.get("limitations"):
-                        response += f"  Note: {', '.join(plan.get('limitations', [])[:2])}\n"
-                    response += f"\n"
+                        parts.append(f"  Note: {', '.join(plan.get('limitations', [])[:2])}\n")
+                    parts.append(f"\n")
                 
                 # Check for credit eligibility
                 if downgrade_options.get("credit_eligible"):
                     credit_amount = downgrade_options.get("credit_amount", 0)
-                    response += f"Good news! You'll receive a ${credit_amount:.2f} credit for the unused portion "
-                    response += f"of your current billing period.\n\n"
+                    parts.extend((
+                        f"Good news! You'll receive a ${credit_amount:.2f} credit for the unused portion ",
+                        f"of your current billing period.\n\n"
+                    ))
                 
-                response += f"I can process this change immediately. The downgrade will take effect at your next billing cycle "
-                response += f"so you can continue using all current features until then. Which plan would you prefer?"
+                parts.extend((
+                    f"I can process this change immediately. The downgrade will take effect at your next billing cycle ",
+                    f"so you can continue using all current features until then. Which plan would you prefer?"
+                ))
+                response = "".join(parts)
                 
                 return {
                     "message": response,
@@ -1045,15 +1651,8 @@ class BillingAgent(BaseAgent):
                     "follow_up_required": True
                 }
             else:
-                response = f"You're currently on our most basic plan, so there aren't any lower-tier options available. "
-                response += f"However, I can help you with:\n\n"
-                response += f"• Pausing your subscription temporarily\n"
-                response += f"• Switching to annual billing for a discount\n"
-                response += f"• Exploring if there are any current promotions\n\n"
-                response += f"What would work best for your situation?"
-                
                 return {
-                    "message": response,
+                    "message": _NO_DOWNGRADES_AVAILABLE,
                     "confidence": 0.8,
                     "success": True,
                     "actions_taken": ["min_plan_notification"],
@@ -1062,8 +1661,8 @@ class BillingAgent(BaseAgent):
                     "follow_up_required": True
                 }
                 
-        except Exception as e:
-            logger.error(f"Subscription downgrade processing failed: {e}")
+        except Exception:
+            logger.exception("Subscription downgrade processing failed")
             return {
                 "message": "I understand you'd like to reduce your costs. Let me connect you with our retention specialist who can explore all money-saving options including special discounts that might be available for your account.",
                 "confidence": 0.6,
@@ -1074,48 +1673,53 @@ class BillingAgent(BaseAgent):
                 "requires_escalation": True
             }
     
-    async def _process_subscription_cancellation(self, message: str, state: AgentState, subscription_info: Dict, tools_used: List[str]) -> Dict[str, Any]:
+    async def _process_subscription_cancellation(self, message: str, state: AgentState, customer_id: Optional[str], agent_context: Dict[str, Any], subscription_info: Dict, tools_used: List[str]) -> Dict[str, Any]:
         """Process subscription cancellation"""
         try:
             # Check cancellation eligibility and terms
             cancellation_info = await self.use_tool(
                 "check_cancellation_terms",
                 {
-                    "customer_id": state.customer.customer_id if state.customer else None,
+                    "customer_id": customer_id,
                     "subscription_id": subscription_info.get("subscription_id")
                 },
-                self.get_agent_context(state)
+                agent_context
             )
             tools_used.append("check_cancellation_terms")
             
             # Calculate any fees or credits
             financial_impact = cancellation_info.get("financial_impact", {})
             
-            response = f"I can help you with your cancellation. Here's what you need to know:\n\n"
+            parts = [f"I can help you with your cancellation. Here's what you need to know:\n\n"]
             
             # Notice period
             notice_period = cancellation_info.get("notice_period", 30)
             effective_date = (datetime.now() + timedelta(days=notice_period)).strftime("%B %d, %Y")
-            response += f"• Cancellation will be effective: {effective_date}\n"
-            response += f"• You'll continue to have full access until then\n"
+            parts.extend((
+                f"• Cancellation will be effective: {effective_date}\n",
+                f"• You'll continue to have full access until then\n"
+            ))
             
             # Financial implications
             if financial_impact.get("early_termination_fee", 0) > 0:
-                response += f"• Early termination fee: ${financial_impact['early_termination_fee']:.2f}\n"
+                parts.append(f"• Early termination fee: ${financial_impact['early_termination_fee']:.2f}\n")
             
             if financial_impact.get("credit_amount", 0) > 0:
-                response += f"• Credit for unused time: ${financial_impact['credit_amount']:.2f}\n"
+                parts.append(f"• Credit for unused time: ${financial_impact['credit_amount']:.2f}\n")
             
             if financial_impact.get("refund_amount", 0) > 0:
-                response += f"• Refund amount: ${financial_impact['refund_amount']:.2f}\n"
+                parts.append(f"• Refund amount: ${financial_impact['refund_amount']:.2f}\n")
             
             # Data and export options
-            response += f"\nBefore I process this:\n"
-            response += f"• I can help you export your data\n"
-            response += f"• Would you like to explore pause options instead?\n"
-            response += f"• Are there any issues I can help resolve to keep your account?\n\n"
+            parts.extend((
+                f"\nBefore I process this:\n",
+                f"• I can help you export your data\n",
+                f"• Would you like to explore pause options instead?\n",
+                f"• Are there any issues I can help resolve to keep your account?\n\n"
+            ))
             
-            response += f"If you're sure about cancelling, I can process this now. What would you prefer?"
+            parts.append(f"If you're sure about cancelling, I can process this now. What would you prefer?")
+            response = "".join(parts)
             
             return {
                 "message": response,
@@ -1129,8 +1733,8 @@ class BillingAgent(BaseAgent):
                 "approval_needed": financial_impact.get("early_termination_fee", 0) > 0
             }
             
-        except Exception as e:
-            logger.error(f"Subscription cancellation processing failed: {e}")
+        except Exception:
+            logger.exception("Subscription cancellation processing failed")
             return {
                 "message": "I want to make sure your cancellation is handled properly and you understand all your options. Let me connect you with our customer retention specialist who can process this and ensure you don't lose any data or credits you're entitled to.",
                 "confidence": 0.6,
@@ -1141,34 +1745,39 @@ class BillingAgent(BaseAgent):
                 "requires_escalation": True
             }
     
-    async def _process_subscription_pause(self, message: str, state: AgentState, subscription_info: Dict, tools_used: List[str]) -> Dict[str, Any]:
+    async def _process_subscription_pause(self, message: str, state: AgentState, customer_id: Optional[str], agent_context: Dict[str, Any], subscription_info: Dict, tools_used: List[str]) -> Dict[str, Any]:
         """Process subscription pause/hold"""
         try:
             # Check pause eligibility
             pause_options = await self.use_tool(
                 "check_pause_eligibility",
                 {
-                    "customer_id": state.customer.customer_id if state.customer else None,
+                    "customer_id": customer_id,
                     "subscription_id": subscription_info.get("subscription_id")
                 },
-                self.get_agent_context(state)
+                agent_context
             )
             tools_used.append("check_pause_eligibility")
             
             if pause_options.get("eligible"):
                 max_pause_days = pause_options.get("max_pause_days", 90)
                 
-                response = f"Yes! I can pause your subscription temporarily. Here are your options:\n\n"
-                response += f"• Maximum pause period: {max_pause_days} days\n"
-                response += f"• Your data will be safely preserved\n"
-                response += f"• No charges during the pause period\n"
-                response += f"• You can reactivate anytime\n\n"
+                parts = [
+                    f"Yes! I can pause your subscription temporarily. Here are your options:\n\n",
+                    f"• Maximum pause period: {max_pause_days} days\n",
+                    f"• Your data will be safely preserved\n",
+                    f"• No charges during the pause period\n",
+                    f"• You can reactivate anytime\n\n"
+                ]
                 
                 if pause_options.get("pause_fee", 0) > 0:
-                    response += f"• Small maintenance fee: ${pause_options['pause_fee']:.2f}/month\n\n"
+                    parts.append(f"• Small maintenance fee: ${pause_options['pause_fee']:.2f}/month\n\n")
                 
-                response += f"How long would you like to pause your subscription? "
-                response += f"I can set it up to automatically reactivate on a specific date if you'd like."
+                parts.extend((
+                    f"How long would you like to pause your subscription? ",
+                    f"I can set it up to automatically reactivate on a specific date if you'd like."
+                ))
+                response = "".join(parts)
                 
                 return {
                     "message": response,
@@ -1180,13 +1789,9 @@ class BillingAgent(BaseAgent):
                     "follow_up_required": True
                 }
             else:
-                reason = pause_options.get("ineligible_reason", "Policy restrictions")
-                response = f"I'm sorry, but your account isn't eligible for subscription pause due to: {reason}\n\n"
-                response += f"However, I can offer these alternatives:\n"
-                response += f"• Downgrade to a lower-cost plan temporarily\n"
-                response += f"• Switch to annual billing for savings\n"
-                response += f"• Explore special retention offers\n\n"
-                response += f"What would work best for your situation?"
+                response = _PAUSE_INELIGIBLE.format(
+                    reason=pause_options.get("ineligible_reason", "Policy restrictions")
+                )
                 
                 return {
                     "message": response,
@@ -1198,8 +1803,8 @@ class BillingAgent(BaseAgent):
                     "follow_up_required": True
                 }
                 
-        except Exception as e:
-            logger.error(f"Subscription pause processing failed: {e}")
+        except Exception:
+            logger.exception("Subscription pause processing failed")
             return {
                 "message": "I'd like to help you pause your subscription. Let me connect you with our account management team who can set up a temporary hold and ensure your account is preserved exactly as you need it.",
                 "confidence": 0.6,
@@ -1210,7 +1815,7 @@ class BillingAgent(BaseAgent):
                 "requires_escalation": True
             }
     
-    async def _process_refund_request(self, message: str, state: AgentState) -> Dict[str, Any]:
+    async def _process_refund_request(self, message: str, state: AgentState, customer_id: Optional[str], agent_context: Dict[str, Any]) -> Dict[str, Any]:
         """Process refund requests"""
         tools_used = []
         
@@ -1218,8 +1823,8 @@ class BillingAgent(BaseAgent):
             # Get refund eligibility information
             refund_eligibility = await self.use_tool(
                 "check_refund_eligibility",
-                {"customer_id": state.customer.customer_id if state.customer else None},
-                self.get_agent_context(state)
+                {"customer_id": customer_id},
+                agent_context
             )
             tools_used.append("check_refund_eligibility")
             
@@ -1228,32 +1833,31 @@ class BillingAgent(BaseAgent):
                 refund_reason = self._determine_refund_reason(message)
                 
                 # Process eligible refund
-                if refund_amount <= self.refund_policies["approval_limits"]["billing_agent"]:
+                if refund_amount <= self._refund_approval_limit:
                     # Can process immediately
                     refund_result = await self.use_tool(
                         "process_refund",
                         {
-                            "customer_id": state.customer.customer_id if state.customer else None,
+                            "customer_id": customer_id,
                             "refund_amount": refund_amount,
                             "reason": refund_reason,
                             "method": refund_eligibility.get("preferred_method", "original_payment")
                         },
-                        self.get_agent_context(state)
+                        agent_context
                     )
                     tools_used.append("process_refund")
                     
                     if refund_result.get("success"):
-                        processing_time = self.refund_policies["processing_times"].get(
+                        processing_time = self._refund_processing_times.get(
                             refund_result.get("method", "credit_card"), "3-5_business_days"
                         )
                         
-                        response = f"✅ Your refund has been approved and processed!\n\n"
-                        response += f"Refund Details:\n"
-                        response += f"• Amount: ${refund_amount:.2f}\n"
-                        response += f"• Method: {refund_result.get('method', 'Original payment method')}\n"
-                        response += f"• Processing Time: {processing_time}\n"
-                        response += f"• Reference ID: {refund_result.get('reference_id', 'REF-' + str(datetime.now().timestamp())[:10])}\n\n"
-                        response += f"You'll receive an email confirmation shortly. Is there anything else I can help you with?"
+                        response = _REFUND_PROCESSED.format(
+                            amount=refund_amount,
+                            method=refund_result.get('method', 'Original payment method'),
+                            processing_time=processing_time,
+                            reference_id=refund_result.get('reference_id') or _fallback_reference('REF')
+                        )
                         
                         return {
                             "message": response,
@@ -1269,11 +1873,7 @@ class BillingAgent(BaseAgent):
                         raise Exception("Refund processing failed")
                 else:
                     # Requires approval
-                    response = f"I can see you're eligible for a ${refund_amount:.2f} refund. "
-                    response += f"Since this amount requires supervisor approval, I'm sending this to our billing manager for immediate review. "
-                    response += f"You'll receive approval and processing confirmation within 24 hours.\n\n"
-                    response += f"I've prioritized your request due to the amount involved. "
-                    response += f"Is there anything else I can help you with while this processes?"
+                    response = _REFUND_PENDING_APPROVAL.format(amount=refund_amount)
                     
                     return {
                         "message": response,
@@ -1284,67 +1884,49 @@ class BillingAgent(BaseAgent):
                         "outcome": "refund_pending_approval",
                         "financial_impact": refund_amount,
                         "approval_needed": True,
-                        "follow_up_date": (datetime.now() + timedelta(hours=24)).isoformat()
+                        "follow_up_date": _follow_up_iso()
                     }
             else:
                 # Not eligible for refund
                 ineligible_reason = refund_eligibility.get("reason", "Policy restrictions")
                 alternative_options = refund_eligibility.get("alternatives", [])
+                has_alternatives = bool(alternative_options)
                 
-                response = f"I've reviewed your account for refund eligibility. Unfortunately, "
-                response += f"your request doesn't qualify for a full refund due to: {ineligible_reason}\n\n"
+                parts = [
+                    f"I've reviewed your account for refund eligibility. Unfortunately, ",
+                    f"your request doesn't qualify for a full refund due to: {ineligible_reason}\n\n"
+                ]
                 
-                if alternative_options:
-                    response += f"However, I can offer these alternatives:\n"
-                    for option in alternative_options:
-                        response += f"• {option}\n"
-                    response += f"\nWould any of these options work for your situation?"
+                if has_alternatives:
+                    parts.append(f"However, I can offer these alternatives:\n")
+                    parts.extend(f"• {option}\n" for option in alternative_options)
+                    parts.append(f"\nWould any of these options work for your situation?")
                 else:
-                    response += f"I understand this may be disappointing. Let me connect you with our billing supervisor "
-                    response += f"who can review your specific circumstances and see if there are any exceptions that might apply."
+                    parts.append(_REFUND_SUPERVISOR_REVIEW)
+                response = "".join(parts)
                 
                 return {
                     "message": response,
                     "confidence": 0.8,
-                    "success": alternative_options is not None and len(alternative_options) > 0,
+                    "success": has_alternatives,
                     "actions_taken": ["refund_eligibility_checked"],
                     "tools_used": tools_used,
                     "outcome": "refund_not_eligible",
-                    "requires_escalation": len(alternative_options) == 0,
-                    "follow_up_required": len(alternative_options) > 0
+                    "requires_escalation": not has_alternatives,
+                    "follow_up_required": has_alternatives
                 }
                 
-        except Exception as e:
-            logger.error(f"Refund processing failed: {e}")
-            return {
-                "message": "I want to make sure your refund request is handled properly. Let me connect you with our billing supervisor who can review your account and process any eligible refunds immediately.",
-                "confidence": 0.5,
-                "success": False,
-                "actions_taken": ["refund_processing_error"],
-                "tools_used": tools_used,
-                "outcome": "escalation_required",
-                "requires_escalation": True
-            }
+        except Exception:
+            logger.exception("Refund processing failed")
+            result = _REFUND_ERROR_RESULT.copy()
+            result["tools_used"] = tools_used
+            return result
     
     def _determine_refund_reason(self, message: str) -> str:
         """Determine the reason for the refund request"""
-        message_lower = message.lower()
-        
-        reason_keywords = {
-            "service_issue": ["not working", "down", "outage", "broken", "problems"],
-            "billing_error": ["wrong charge", "error", "mistake", "incorrect"],
-            "dissatisfaction": ["unhappy", "disappointed", "not satisfied", "doesn't work"],
-            "cancellation": ["cancelled", "don't want", "no longer need"],
-            "duplicate_payment": ["charged twice", "double payment", "duplicate"]
-        }
-        
-        for reason, keywords in reason_keywords.items():
-            if any(keyword in message_lower for keyword in keywords):
-                return reason
-        
-        return "customer_request"
+        return _classify_refund_reason(_lowercase(message))
     
-    async def _provide_billing_information(self, message: str, state: AgentState) -> Dict[str, Any]:
+    async def _provide_billing_information(self, message: str, state: AgentState, customer_id: Optional[str], agent_context: Dict[str, Any]) -> Dict[str, Any]:
         """Provide billing information and account details"""
         tools_used = []
         
@@ -1353,53 +1935,28 @@ class BillingAgent(BaseAgent):
             billing_summary = await self.use_tool(
                 "get_billing_summary",
                 {
-                    "customer_id": state.customer.customer_id if state.customer else None,
+                    "customer_id": customer_id,
                     "include_history": True,
                     "include_upcoming": True
                 },
-                self.get_agent_context(state)
+                agent_context
             )
             tools_used.append("get_billing_summary")
             
-            response = f"Here's your current billing information:\n\n"
-            
-            # Current account status
-            response += f"📊 Account Status:\n"
-            response += f"• Balance: ${billing_summary.get('current_balance', 0):.2f}\n"
-            response += f"• Status: {billing_summary.get('account_status', 'Active')}\n"
-            response += f"• Next billing date: {billing_summary.get('next_billing_date', 'Not scheduled')}\n\n"
-            
-            # Current subscription
-            if billing_summary.get('current_subscription'):
-                sub = billing_summary['current_subscription']
-                response += f"💳 Current Subscription:\n"
-                response += f"• Plan: {sub.get('plan_name', 'N/A')}\n"
-                response += f"• Monthly cost: ${sub.get('monthly_cost', 0):.2f}\n"
-                response += f"• Billing cycle: {sub.get('billing_cycle', 'Monthly')}\n\n"
+            parts = [_BILLING_STATUS.format(
+                balance=billing_summary.get('current_balance', 0),
+                status=billing_summary.get('account_status', 'Active'),
+                next_billing_date=billing_summary.get('next_billing_date', 'Not scheduled')
+            )]
             
-            # Recent transactions
-            if billing_summary.get('recent_transactions'):
-                response += f"💰 Recent Transactions:\n"
-                for transaction in billing_summary['recent_transactions'][:3]:
-                    response += f"• {transaction.get('date', 'N/A')}: ${transaction.get('amount', 0):.2f} - {transaction.get('description', 'Payment')}\n"
-                response += f"\n"
+            # Optional sections, in display order; absent ones are skipped
+            for key, format_section in _BILLING_SECTIONS:
+                section = billing_summary.get(key)
+                if section:
+                    parts.append(format_section(section))
             
-            # Payment method
-            if billing_summary.get('payment_method'):
-                payment = billing_summary['payment_method']
-                response += f"💳 Payment Method:\n"
-                response += f"• Type: {payment.get('type', 'N/A')}\n"
-                response += f"• Last 4 digits: {payment.get('last_four', 'N/A')}\n"
-                response += f"• Expires: {payment.get('expiry', 'N/A')}\n\n"
-            
-            # Upcoming charges
-            if billing_summary.get('upcoming_charges'):
-                response += f"📅 Upcoming Charges:\n"
-                for charge in billing_summary['upcoming_charges']:
-                    response += f"• {charge.get('date', 'N/A')}: ${charge.get('amount', 0):.2f} - {charge.get('description', 'Subscription')}\n"
-                response += f"\n"
-            
-            response += f"Need more details about any of these items? I can provide detailed breakdowns or help with any billing questions you have!"
+            parts.append(_BILLING_INFO_CLOSING)
+            response = "".join(parts)
             
             return {
                 "message": response,
@@ -1411,41 +1968,43 @@ class BillingAgent(BaseAgent):
                 "follow_up_required": True
             }
             
-        except Exception as e:
-            logger.error(f"Billing information retrieval failed: {e}")
-            return {
-                "message": "I'm having trouble accessing your billing information right now. Let me connect you with our billing specialist who can provide you with a complete account summary and answer any billing questions you have.",
-                "confidence": 0.5,
-                "success": False,
-                "actions_taken": ["billing_info_retrieval_failed"],
-                "tools_used": tools_used,
-                "outcome": "escalation_required",
-                "requires_escalation": True
-            }
+        except Exception:
+            logger.exception("Billing information retrieval failed")
+            result = _BILLING_INFO_ERROR_RESULT.copy()
+            result["tools_used"] = tools_used
+            return result
     
-    async def _update_payment_method(self, message: str, state: AgentState) -> Dict[str, Any]:
+    async def _update_payment_method(self, message: str, state: AgentState, customer_id: Optional[str], agent_context: Dict[str, Any]) -> Dict[str, Any]:
         """Update customer payment method"""
         tools_used = []
         
         try:
-            # Verify customer identity for payment method changes
-            verification_result = await self.use_tool(
-                "verify_customer_identity",
-                {
-                    "customer_id": state.customer.customer_id if state.customer else None,
-                    "verification_type": "payment_method_update"
-                },
-                self.get_agent_context(state)
+            # Verify customer identity for payment method changes. The
+            # methods on file are fetched alongside; they are only shown once
+            # verification passes.
+            verification_result, current_payment = await asyncio.gather(
+                self.use_tool(
+                    "verify_customer_identity",
+                    {
+                        "customer_id": customer_id,
+                        "verification_type": "payment_method_update"
+                    },
+                    agent_context
+                ),
+                self.use_tool(
+                    "get_payment_methods",
+                    {"customer_id": customer_id},
+                    agent_context
+                ),
+                return_exceptions=True
             )
-            tools_used.append("verify_customer_identity")
+            tools_used.extend(("verify_customer_identity", "get_payment_methods"))
+            if isinstance(verification_result, Exception):
+                raise verification_result
             
             if not verification_result.get("verified"):
-                response = "For security purposes, I need to verify your identity before updating payment information. "
-                response += "I'm going to connect you with our secure billing line where you can safely update your payment method "
-                response += "after completing our standard verification process."
-                
                 return {
-                    "message": response,
+                    "message": _IDENTITY_VERIFICATION_REQUIRED,
                     "confidence": 0.8,
                     "success": False,
                     "actions_taken": ["identity_verification_required"],
@@ -1454,30 +2013,20 @@ class BillingAgent(BaseAgent):
                     "requires_escalation": True
                 }
             
-            # Get current payment method info
-            current_payment = await self.use_tool(
-                "get_payment_methods",
-                {"customer_id": state.customer.customer_id if state.customer else None},
-                self.get_agent_context(state)
-            )
-            tools_used.append("get_payment_methods")
+            if isinstance(current_payment, Exception):
+                raise current_payment
             
-            response = "I can help you update your payment method securely. Here's what's currently on file:\n\n"
+            parts = ["I can help you update your payment method securely. Here's what's currently on file:\n\n"]
             
             if current_payment.get("methods"):
                 for method in current_payment["methods"]:
-                    response += f"• {method.get('type', 'Card')}: ****{method.get('last_four', 'XXXX')} "
-                    response += f"(Expires: {method.get('expiry', 'Unknown')})\n"
-            
-            response += f"\nI can help you:\n"
-            response += f"• Add a new credit/debit card\n"
-            response += f"• Update your existing card information\n"
-            response += f"• Set up bank account (ACH) payments\n"
-            response += f"• Add PayPal or other digital wallets\n\n"
+                    parts.extend((
+                        f"• {method.get('type', 'Card')}: ****{method.get('last_four', 'XXXX')} ",
+                        f"(Expires: {method.get('expiry', 'Unknown')})\n"
+                    ))
             
-            response += f"For security, I'll need to send you to our secure payment portal to enter the new information. "
-            response += f"This ensures your financial data is protected with bank-level encryption.\n\n"
-            response += f"Would you like me to generate a secure link for you to update your payment method?"
+            parts.append(_PAYMENT_METHOD_OPTIONS)
+            response = "".join(parts)
             
             return {
                 "message": response,
@@ -1489,19 +2038,13 @@ class BillingAgent(BaseAgent):
                 "follow_up_required": True
             }
             
-        except Exception as e:
-            logger.error(f"Payment method update failed: {e}")
-            return {
-                "message": "I want to make sure your payment information is updated securely. Let me connect you with our billing team who can safely process payment method changes and ensure your account continues without interruption.",
-                "confidence": 0.6,
-                "success": False,
-                "actions_taken": ["payment_update_failed"],
-                "tools_used": tools_used,
-                "outcome": "secure_escalation_required",
-                "requires_escalation": True
-            }
+        except Exception:
+            logger.exception("Payment method update failed")
+            result = _PAYMENT_UPDATE_ERROR_RESULT.copy()
+            result["tools_used"] = tools_used
+            return result
     
-    async def _restore_account_access(self, message: str, state: AgentState) -> Dict[str, Any]:
+    async def _restore_account_access(self, message: str, state: AgentState, customer_id: Optional[str], agent_context: Dict[str, Any]) -> Dict[str, Any]:
         """Restore account access for suspended accounts"""
         tools_used = []
         
@@ -1509,22 +2052,14 @@ class BillingAgent(BaseAgent):
             # Check account suspension status and reason
             account_status = await self.use_tool(
                 "get_account_suspension_details",
-                {"customer_id": state.customer.customer_id if state.customer else None},
-                self.get_agent_context(state)
+                {"customer_id": customer_id},
+                agent_context
             )
             tools_used.append("get_account_suspension_details")
             
             if not account_status.get("suspended"):
-                response = "Good news! Your account is actually active and not suspended. "
-                response += "If you're having trouble accessing your account, this might be a technical issue or login problem. "
-                response += "Let me help you troubleshoot:\n\n"
-                response += "• Try clearing your browser cache and cookies\n"
-                response += "• Make sure you're using the correct login URL\n"
-                response += "• Check if you need to reset your password\n\n"
-                response += "Are you getting any specific error messages when trying to log in?"
-                
                 return {
-                    "message": response,
+                    "message": _ACCOUNT_NOT_SUSPENDED,
                     "confidence": 0.8,
                     "success": True,
                     "actions_taken": ["account_status_verified"],
@@ -1537,17 +2072,12 @@ class BillingAgent(BaseAgent):
             suspension_reason = account_status.get("reason", "unknown")
             outstanding_balance = account_status.get("outstanding_balance", 0)
             
-            response = f"I can see your account is currently suspended due to: {suspension_reason}\n\n"
+            suspension_notice = _ACCOUNT_SUSPENDED.format(reason=suspension_reason)
             
             if suspension_reason == "payment_failure" and outstanding_balance > 0:
-                response += f"Outstanding Balance: ${outstanding_balance:.2f}\n\n"
-                response += f"To restore your account immediately, I can:\n"
-                response += f"• Process payment for the outstanding balance\n"
-                response += f"• Set up a payment plan if needed\n"
-                response += f"• Update your payment method if that's the issue\n\n"
-                
-                response += f"Once payment is resolved, your account will be reactivated within minutes. "
-                response += f"Would you like to take care of this now?"
+                response = suspension_notice + _SUSPENDED_PAYMENT_OPTIONS.format(
+                    balance=outstanding_balance
+                )
                 
                 return {
                     "message": response,
@@ -1561,9 +2091,7 @@ class BillingAgent(BaseAgent):
                 }
             
             elif suspension_reason == "policy_violation":
-                response += f"This type of suspension requires review by our compliance team. "
-                response += f"Let me connect you with a supervisor who can review your case and work on getting "
-                response += f"your account restored as quickly as possible."
+                response = suspension_notice + _SUSPENDED_COMPLIANCE_REVIEW
                 
                 return {
                     "message": response,
@@ -1580,17 +2108,15 @@ class BillingAgent(BaseAgent):
                 restoration_result = await self.use_tool(
                     "attempt_account_restoration",
                     {
-                        "customer_id": state.customer.customer_id if state.customer else None,
+                        "customer_id": customer_id,
                         "reason": "customer_request"
                     },
-                    self.get_agent_context(state)
+                    agent_context
                 )
                 tools_used.append("attempt_account_restoration")
                 
                 if restoration_result.get("success"):
-                    response += f"Great news! I was able to restore your account access immediately. "
-                    response += f"Your account is now fully active and you should be able to log in normally.\n\n"
-                    response += f"Please try logging in again, and let me know if you encounter any issues."
+                    response = suspension_notice + _ACCOUNT_RESTORED
                     
                     return {
                         "message": response,
@@ -1602,8 +2128,7 @@ class BillingAgent(BaseAgent):
                         "account_impact": "reactivated"
                     }
                 else:
-                    response += f"I'm unable to automatically restore your account. Let me connect you with "
-                    response += f"our account restoration specialist who can manually review and reactivate your account."
+                    response = suspension_notice + _ACCOUNT_RESTORATION_FAILED
                     
                     return {
                         "message": response,
@@ -1615,19 +2140,13 @@ class BillingAgent(BaseAgent):
                         "requires_escalation": True
                     }
             
-        except Exception as e:
-            logger.error(f"Account access restoration failed: {e}")
-            return {
-                "message": "I understand you need to regain access to your account urgently. Let me connect you immediately with our account restoration team who can resolve this and get you back up and running.",
-                "confidence": 0.5,
-                "success": False,
-                "actions_taken": ["account_restoration_error"],
-                "tools_used": tools_used,
-                "outcome": "urgent_escalation_required",
-                "requires_escalation": True
-            }
+        except Exception:
+            logger.exception("Account access restoration failed")
+            result = _RESTORE_ERROR_RESULT.copy()
+            result["tools_used"] = tools_used
+            return result
     
-    async def _restore_urgent_account_access(self, message: str, state: AgentState) -> Dict[str, Any]:
+    async def _restore_urgent_account_access(self, message: str, state: AgentState, customer_id: Optional[str], agent_context: Dict[str, Any]) -> Dict[str, Any]:
         """Handle urgent account access restoration"""
         tools_used = []
         
@@ -1636,28 +2155,18 @@ class BillingAgent(BaseAgent):
             urgent_restoration = await self.use_tool(
                 "urgent_account_restoration",
                 {
-                    "customer_id": state.customer.customer_id if state.customer else None,
+                    "customer_id": customer_id,
                     "agent_override": True,
                     "business_impact": "high"
                 },
-                self.get_agent_context(state)
+                agent_context
             )
             tools_used.append("urgent_account_restoration")
             
             if urgent_restoration.get("success"):
-                response = "🚨 URGENT RESTORATION COMPLETED 🚨\n\n"
-                response += "Your account has been immediately reactivated with full access. "
-                response += "I understand this was business-critical, so I've:\n\n"
-                response += "• Restored all services immediately\n"
-                response += "• Applied a 72-hour grace period for any outstanding issues\n"
-                response += "• Flagged your account for priority support\n\n"
-                
-                if urgent_restoration.get("follow_up_required"):
-                    response += "Important: Please resolve any outstanding billing matters within 72 hours "
-                    response += "to prevent future interruptions. I'll have our billing team contact you today "
-                    response += "to ensure everything stays resolved.\n\n"
-                
-                response += "Your business operations should be fully restored now. Please confirm everything is working properly."
+                response = _URGENT_RESTORATION_COMPLETED.format(
+                    follow_up=_URGENT_RESTORATION_FOLLOW_UP if urgent_restoration.get("follow_up_required") else ""
+                )
                 
                 return {
                     "message": response,
@@ -1668,15 +2177,11 @@ class BillingAgent(BaseAgent):
                     "outcome": "urgent_access_restored",
                     "account_impact": "immediately_reactivated",
                     "follow_up_required": urgent_restoration.get("follow_up_required", False),
-                    "follow_up_date": (datetime.now() + timedelta(hours=24)).isoformat()
+                    "follow_up_date": _follow_up_iso()
                 }
             else:
                 # Even urgent restoration failed - immediate escalation
-                response = "🚨 URGENT ESCALATION 🚨\n\n"
-                response += "I understand this is a critical business issue. I'm immediately connecting you "
-                response += "with our emergency account restoration team. You'll be transferred within 30 seconds "
-                response += "to a specialist who has override authority to restore your access immediately.\n\n"
-                response += "Reference this conversation ID when you speak with them: " + state.conversation_id
+                response = _URGENT_ESCALATION + state.conversation_id
                 
                 return {
                     "message": response,
@@ -1689,20 +2194,13 @@ class BillingAgent(BaseAgent):
                     "priority_escalation": True
                 }
                 
-        except Exception as e:
-            logger.error(f"Urgent account restoration failed: {e}")
-            return {
-                "message": "🚨 CRITICAL ISSUE 🚨 I'm immediately transferring you to our emergency response team. They will call you within 2 minutes to restore your access. Please stay on the line.",
-                "confidence": 0.7,
-                "success": False,
-                "actions_taken": ["critical_escalation"],
-                "tools_used": tools_used,
-                "outcome": "critical_escalation_required",
-                "requires_escalation": True,
-                "priority_escalation": True
-            }
+        except Exception:
+            logger.exception("Urgent account restoration failed")
+            result = _URGENT_RESTORE_ERROR_RESULT.copy()
+            result["tools_used"] = tools_used
+            return result
     
-    async def _provide_general_billing_support(self, message: str, state: AgentState) -> Dict[str, Any]:
+    async def _provide_general_billing_support(self, message: str, state: AgentState, customer_id: Optional[str], agent_context: Dict[str, Any]) -> Dict[str, Any]:
         """Provide general billing support and guidance"""
         tools_used = []
         
@@ -1710,46 +2208,15 @@ class BillingAgent(BaseAgent):
             # Get basic account overview
             account_overview = await self.use_tool(
                 "get_account_overview",
-                {"customer_id": state.customer.customer_id if state.customer else None},
-                self.get_agent_context(state)
+                {"customer_id": customer_id},
+                agent_context
             )
             tools_used.append("get_account_overview")
             
-            response = "I'm here to help with any billing questions you have! "
-            
             if account_overview.get("success"):
-                response += f"I can see your account is in good standing. Here's what I can help you with:\n\n"
-                response += f"💳 Billing & Payments:\n"
-                response += f"• View your current balance and payment history\n"
-                response += f"• Update payment methods securely\n"
-                response += f"• Set up automatic payments\n"
-                response += f"• Download invoices and tax documents\n\n"
-                
-                response += f"📋 Subscription Management:\n"
-                response += f"• Upgrade or downgrade your plan\n"
-                response += f"• Change billing cycles (monthly/annual)\n"
-                response += f"• Add or remove features\n"
-                response += f"• Pause or cancel subscriptions\n\n"
-                
-                response += f"💰 Refunds & Credits:\n"
-                response += f"• Process eligible refunds\n"
-                response += f"• Apply account credits\n"
-                response += f"• Resolve billing disputes\n"
-                response += f"• Explain charges and fees\n\n"
-                
-                response += f"🔒 Account Security:\n"
-                response += f"• Update billing address\n"
-                response += f"• Manage authorized users\n"
-                response += f"• Review account access logs\n\n"
+                response = _BILLING_SUPPORT_MENU
             else:
-                response += f"Here are the billing services I can help you with:\n\n"
-                response += f"• Payment issues and failed transactions\n"
-                response += f"• Subscription changes and upgrades\n"
-                response += f"• Refund requests and billing disputes\n"
-                response += f"• Invoice questions and payment history\n"
-                response += f"• Account access and security issues\n\n"
-            
-            response += f"What specific billing question can I answer for you today?"
+                response = _BILLING_SERVICES_MENU
             
             return {
                 "message": response,
@@ -1761,8 +2228,8 @@ class BillingAgent(BaseAgent):
                 "follow_up_required": True
             }
             
-        except Exception as e:
-            logger.error(f"General billing support failed: {e}")
+        except Exception:
+            logger.exception("General billing support failed")
             return {
                 "message": "I'm here to help with all your billing needs! I can assist with payments, subscriptions, refunds, account issues, and any other billing questions. What specific area would you like help with today?",
                 "confidence": 0.7,
@@ -1773,7 +2240,7 @@ class BillingAgent(BaseAgent):
                 "follow_up_required": True
             }
     
-    async def _check_account_alerts(self, state: AgentState) -> List[Dict[str, Any]]:
+    async def _check_account_alerts(self, state: AgentState, customer_id: Optional[str], agent_context: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Check for any account alerts or issues that need attention"""
         alerts = []
         
@@ -1781,22 +2248,23 @@ class BillingAgent(BaseAgent):
             # This would typically check various systems for alerts
             alert_check = await self.use_tool(
                 "check_account_alerts",
-                {"customer_id": state.customer.customer_id if state.customer else None},
-                self.get_agent_context(state)
+                {"customer_id": customer_id},
+                agent_context
             )
             
-            if alert_check.get("alerts"):
-                for alert in alert_check["alerts"]:
-                    alerts.append({
-                        "type": alert.get("type", "general"),
-                        "severity": alert.get("severity", "low"),
-                        "message": alert.get("message", "Account alert"),
-                        "action_required": alert.get("action_required", False),
-                        "due_date": alert.get("due_date")
-                    })
+            alerts = [
+                {
+                    "type": alert.get("type", "general"),
+                    "severity": alert.get("severity", "low"),
+                    "message": alert.get("message", "Account alert"),
+                    "action_required": alert.get("action_required", False),
+                    "due_date": alert.get("due_date")
+                }
+                for alert in alert_check.get("alerts") or ()
+            ]
             
-        except Exception as e:
-            logger.warning(f"Account alerts check failed: {e}")
+        except Exception:
+            logger.warning("Account alerts check failed", exc_info=True)
             # Don't fail the main operation if alerts check fails
         
         return alerts
@@ -1805,13 +2273,14 @@ class BillingAgent(BaseAgent):
         self, 
         billing_analysis: Dict[str, Any], 
         response: Dict[str, Any], 
-        state: AgentState
+        state: AgentState,
+        customer_id: Optional[str]
     ):
         """Update billing interaction history for future reference"""
         try:
             interaction_data = {
                 "conversation_id": state.conversation_id,
-                "customer_id": state.customer.customer_id if state.customer else None,
+                "customer_id": customer_id,
                 "inquiry_type": billing_analysis.get("inquiry_type"),
                 "resolution_outcome": response.get("outcome"),
                 "financial_impact": response.get("financial_impact", 0),
@@ -1822,7 +2291,7 @@ class BillingAgent(BaseAgent):
             }
             
             # This would typically update a billing CRM or history system
-            logger.info(f"Billing interaction recorded: {interaction_data}")
+            logger.info("Billing interaction recorded", interaction=interaction_data)
             
-        except Exception as e:
-            logger.warning(f"Failed to update billing interaction history: {e}")
\ No newline at end of file
+        except Exception:
+            logger.warning("Failed to update billing interaction history", exc_info=True)
\ No newline at end of file
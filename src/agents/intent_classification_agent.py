@@ -2,7 +2,7 @@
 Intent Classification Agent for Contact Center Agentic Flow System
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 import re
 
@@ -16,6 +16,14 @@ logger = get_logger(__name__)
 class IntentClassificationAgent(BaseAgent):
     """Agent specialized in intent classification and sentiment analysis"""
     
+    _PERMISSIONS: Tuple[str, ...] = (
+        "read_customer_data",
+        "read_knowledge_base",
+        "write_analytics",
+        "classify_intent",
+        "analyze_sentiment",
+    )
+    
     def __init__(
         self,
         name: str,
@@ -96,20 +104,14 @@ class IntentClassificationAgent(BaseAgent):
                 "error": str(e)
             }
     
-    async def can_handle(self, state: AgentState) -> bool:
+    def can_handle(self, state: AgentState) -> bool:
         """Determine if this agent can handle the current state"""
         # Intent classification agent can handle any message that needs classification
         return True
     
-    def _get_agent_permissions(self) -> List[str]:
+    def _get_agent_permissions(self) -> Tuple[str, ...]:
         """Get the permissions available to this agent"""
-        return [
-            "read_customer_data",
-            "read_knowledge_base", 
-            "write_analytics",
-            "classify_intent",
-            "analyze_sentiment"
-        ]
+        return self._PERMISSIONS
     
     def _initialize_intent_patterns(self) -> Dict[str, Dict[str, Any]]:
         """Initialize intent classification patterns"""
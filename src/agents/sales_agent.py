@@ -2,7 +2,7 @@
 Sales Agent for Contact Center Agentic Flow System
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 import re
 
@@ -16,6 +16,19 @@ logger = get_logger(__name__)
 class SalesAgent(BaseAgent):
     """Agent specialized in product inquiries, quotes, and sales opportunities"""
     
+    _PERMISSIONS: Tuple[str, ...] = (
+        "read_customer_data",
+        "access_product_catalog",
+        "generate_quotes",
+        "process_orders",
+        "check_inventory",
+        "access_pricing_engine",
+        "create_sales_opportunities",
+        "schedule_demos",
+        "apply_discounts",
+        "access_contract_templates",
+    )
+    
     def __init__(
         self,
         name: str,
@@ -95,7 +108,7 @@ class SalesAgent(BaseAgent):
                 "error": str(e)
             }
     
-    async def can_handle(self, state: AgentState) -> bool:
+    def can_handle(self, state: AgentState) -> bool:
         """Determine if this agent can handle the current state"""
         # Sales-related intents
         sales_intents = [
@@ -128,20 +141,9 @@ class SalesAgent(BaseAgent):
         
         return can_handle_intent or sales_keywords_present or exploration_phase
     
-    def _get_agent_permissions(self) -> List[str]:
+    def _get_agent_permissions(self) -> Tuple[str, ...]:
         """Get the permissions available to this agent"""
-        return [
-            "read_customer_data",
-            "access_product_catalog",
-            "generate_quotes",
-            "process_orders",
-            "check_inventory",
-            "access_pricing_engine",
-            "create_sales_opportunities",
-            "schedule_demos",
-            "apply_discounts",
-            "access_contract_templates"
-        ]
+        return self._PERMISSIONS
     
     def _initialize_product_catalog(self) -> Dict[str, Dict[str, Any]]:
         """Initialize product catalog with features and benefits"""
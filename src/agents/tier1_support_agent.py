@@ -2,7 +2,7 @@
 Tier 1 Support Agent for Contact Center Agentic Flow System
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 from src.agents.base_agent import BaseAgent
@@ -15,6 +15,15 @@ logger = get_logger(__name__)
 class Tier1SupportAgent(BaseAgent):
     """Agent specialized in handling basic customer support inquiries"""
     
+    _PERMISSIONS: Tuple[str, ...] = (
+        "read_customer_data",
+        "read_knowledge_base",
+        "create_tickets",
+        "update_tickets",
+        "send_notifications",
+        "basic_account_operations",
+    )
+    
     def __init__(
         self,
         name: str,
@@ -76,7 +85,7 @@ class Tier1SupportAgent(BaseAgent):
                 "error": str(e)
             }
     
-    async def can_handle(self, state: AgentState) -> bool:
+    def can_handle(self, state: AgentState) -> bool:
         """Determine if this agent can handle the current state"""
         # Check if the intent is within Tier 1 capabilities
         tier1_intents = [
@@ -94,16 +103,9 @@ class Tier1SupportAgent(BaseAgent):
         
         return can_handle_intent and not_too_complex and sentiment_ok
     
-    def _get_agent_permissions(self) -> List[str]:
+    def _get_agent_permissions(self) -> Tuple[str, ...]:
         """Get the permissions available to this agent"""
-        return [
-            "read_customer_data",
-            "read_knowledge_base",
-            "create_tickets",
-            "update_tickets",
-            "send_notifications",
-            "basic_account_operations"
-        ]
+        return self._PERMISSIONS
     
     def _initialize_faq_responses(self) -> Dict[str, Dict[str, Any]]:
         """Initialize FAQ responses for common questions"""
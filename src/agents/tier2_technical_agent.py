@@ -2,7 +2,7 @@
 Tier 2 Technical Agent for Contact Center Agentic Flow System
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 from src.agents.base_agent import BaseAgent
@@ -15,6 +15,17 @@ logger = get_logger(__name__)
 class Tier2TechnicalAgent(BaseAgent):
     """Agent specialized in advanced technical support and complex troubleshooting"""
     
+    _PERMISSIONS: Tuple[str, ...] = (
+        "read_customer_data",
+        "read_system_logs",
+        "run_diagnostics",
+        "access_configuration",
+        "update_system_settings",
+        "schedule_maintenance",
+        "create_technical_tickets",
+        "access_similar_cases",
+    )
+    
     def __init__(
         self,
         name: str,
@@ -85,7 +96,7 @@ class Tier2TechnicalAgent(BaseAgent):
                 "error": str(e)
             }
     
-    async def can_handle(self, state: AgentState) -> bool:
+    def can_handle(self, state: AgentState) -> bool:
         """Determine if this agent can handle the current state"""
         # Technical intents that Tier 2 can handle
         tier2_intents = [
@@ -110,18 +121,9 @@ class Tier2TechnicalAgent(BaseAgent):
         
         return can_handle_intent or escalated_from_tier1 and not_system_level
     
-    def _get_agent_permissions(self) -> List[str]:
+    def _get_agent_permissions(self) -> Tuple[str, ...]:
         """Get the permissions available to this agent"""
-        return [
-            "read_customer_data",
-            "read_system_logs",
-            "run_diagnostics",
-            "access_configuration",
-            "update_system_settings",
-            "schedule_maintenance",
-            "create_technical_tickets",
-            "access_similar_cases"
-        ]
+        return self._PERMISSIONS
     
     def _initialize_diagnostic_procedures(self) -> Dict[str, Dict[str, Any]]:
         """Initialize advanced diagnostic procedures"""
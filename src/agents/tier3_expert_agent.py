@@ -2,7 +2,7 @@
 Tier 3 Expert Agent for Contact Center Agentic Flow System
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 from src.agents.base_agent import BaseAgent
@@ -15,6 +15,19 @@ logger = get_logger(__name__)
 class Tier3ExpertAgent(BaseAgent):
     """Agent specialized in critical issues, system modifications, and complex problem resolution"""
     
+    _PERMISSIONS: Tuple[str, ...] = (
+        "all_customer_operations",
+        "system_modifications",
+        "security_operations",
+        "compliance_operations",
+        "executive_escalation",
+        "emergency_procedures",
+        "financial_adjustments",
+        "service_modifications",
+        "audit_log_access",
+        "emergency_override",
+    )
+    
     def __init__(
         self,
         name: str,
@@ -91,7 +104,7 @@ class Tier3ExpertAgent(BaseAgent):
                 "error": str(e)
             }
     
-    async def can_handle(self, state: AgentState) -> bool:
+    def can_handle(self, state: AgentState) -> bool:
         """Determine if this agent can handle the current state"""
         # Critical intents that require Tier 3
         tier3_intents = [
@@ -126,20 +139,9 @@ class Tier3ExpertAgent(BaseAgent):
         return (requires_tier3_intent or escalated_from_tier2 or 
                 vip_high_impact or sla_breach_risk)
     
-    def _get_agent_permissions(self) -> List[str]:
+    def _get_agent_permissions(self) -> Tuple[str, ...]:
         """Get the permissions available to this agent"""
-        return [
-            "all_customer_operations",
-            "system_modifications",
-            "security_operations",
-            "compliance_operations",
-            "executive_escalation",
-            "emergency_procedures",
-            "financial_adjustments",
-            "service_modifications",
-            "audit_log_access",
-            "emergency_override"
-        ]
+        return self._PERMISSIONS
     
     def _initialize_critical_procedures(self) -> Dict[str, Dict[str, Any]]:
         """Initialize critical issue handling procedures"""
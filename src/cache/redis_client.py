@@ -2,10 +2,10 @@
 Redis client for caching and session management
 """
 
-import json
-from typing import Any, Optional, Dict, Union
+from typing import Any, Optional, Dict, List, Union
 import asyncio
 
+import orjson
 import redis.asyncio as redis
 from redis.asyncio import ConnectionPool
 
@@ -60,7 +60,7 @@ class RedisClient:
             logger.error(f"Failed to get key {key}: {e}")
             return None
     
-    async def set(self, key: str, value: str, ttl: Optional[int] = None) -> bool:
+    async def set(self, key: str, value: Union[str, bytes], ttl: Optional[int] = None) -> bool:
         """Set key-value pair with optional TTL"""
         if not self._client:
             raise RuntimeError("Redis client not initialized")
@@ -142,6 +142,29 @@ class RedisClient:
             logger.error(f"Failed to get hash {key}: {e}")
             return {}
 
+    
+    async def rpush(self, key: str, *values: Union[str, bytes]) -> int:
+        """Append values to the tail of a list"""
+        if not self._client:
+            raise RuntimeError("Redis client not initialized")
+        
+        try:
+            return await self._client.rpush(key, *values)
+        except Exception as e:
+            logger.error(f"Failed to push to list {key}: {e}")
+            return 0
+    
+    async def lrange(self, key: str, start: int = 0, end: int = -1) -> list:
+        """Get a range of list elements"""
+        if not self._client:
+            raise RuntimeError("Redis client not initialized")
+        
+        try:
+            return await self._client.lrange(key, start, end)
+        except Exception as e:
+            logger.error(f"Failed to get list {key}: {e}")
+            return []
+
 
 # Global Redis client instance
 redis_client = RedisClient()
@@ -159,8 +182,8 @@ class CacheManager:
         value = await self.client.get(key)
         if value:
             try:
-                return json.loads(value)
-            except json.JSONDecodeError:
+                return orjson.loads(value)
+            except orjson.JSONDecodeError:
                 logger.error(f"Failed to decode JSON from cache key: {key}")
         return None
     
@@ -168,7 +191,7 @@ class CacheManager:
                       ttl: Optional[int] = None) -> bool:
         """Set JSON value in cache"""
         try:
-            json_value = json.dumps(value, default=str)
+            json_value = orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
             return await self.client.set(key, json_value, ttl or self.default_ttl)
         except Exception as e:
             logger.error(f"Failed to set JSON cache key {key}: {e}")
@@ -185,6 +208,46 @@ class CacheManager:
         key = f"conversation:{conversation_id}:context"
         return await self.set_json(key, context)
     
+    async def get_conversation_head(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Get the mutable part of a conversation context (everything but messages)"""
+        key = f"conversation:{conversation_id}:head"
+        return await self.get_json(key)
+    
+    async def set_conversation_head(self, conversation_id: str, 
+                                    head: Dict[str, Any]) -> bool:
+        """Set the mutable part of a conversation context"""
+        key = f"conversation:{conversation_id}:head"
+        return await self.set_json(key, head)
+    
+    async def get_conversation_messages(self, conversation_id: str) -> List[Dict[str, Any]]:
+        """Get the full message history of a conversation"""
+        key = f"conversation:{conversation_id}:messages"
+        messages = []
+        for value in await self.client.lrange(key):
+            try:
+                messages.append(orjson.loads(value))
+            except orjson.JSONDecodeError:
+                logger.error(f"Failed to decode message from cache key: {key}")
+        return messages
+    
+    async def append_messages(self, conversation_id: str, 
+                              messages: List[Dict[str, Any]]) -> bool:
+        """Append new messages to a conversation's history in one RPUSH"""
+        if not messages:
+            return True
+        key = f"conversation:{conversation_id}:messages"
+        try:
+            values = [
+                orjson.dumps(message, default=str, option=orjson.OPT_NON_STR_KEYS)
+                for message in messages
+            ]
+            if not await self.client.rpush(key, *values):
+                return False
+            return await self.client.expire(key, self.default_ttl)
+        except Exception as e:
+            logger.error(f"Failed to append messages to cache key {key}: {e}")
+            return False
+    
     async def get_agent_state(self, conversation_id: str, agent_type: str) -> Optional[Dict[str, Any]]:
         """Get agent state from cache"""
         key = f"conversation:{conversation_id}:agent:{agent_type}:state"
@@ -28,8 +28,11 @@ def setup_logging(log_level: str = "INFO") -> None:
             structlog.contextvars.merge_contextvars,
             structlog.processors.add_log_level,
             structlog.processors.TimeStamper(fmt="iso"),
-            structlog.dev.ConsoleRenderer() if get_settings().debug 
-            else structlog.processors.JSONRenderer(),
+            # ConsoleRenderer formats exc_info itself; JSON output needs the
+            # traceback rendered into the event first
+            *((structlog.dev.ConsoleRenderer(),) if get_settings().debug
+              else (structlog.processors.format_exc_info,
+                    structlog.processors.JSONRenderer())),
         ],
         wrapper_class=structlog.make_filtering_bound_logger(
             getattr(logging, log_level.upper())
@@ -0,0 +1,67 @@
+"""
+Shared asyncpg connection pool for maintenance scripts
+"""
+
+import json
+from typing import Optional
+
+import asyncpg
+
+from src.core.config import get_settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+# Global pool shared by diagnose/fix/reset helpers
+_pool: Optional[asyncpg.Pool] = None
+
+
+def get_dsn() -> str:
+    """Get the configured database URL in asyncpg-native form"""
+    database_url = get_settings().database_url
+    if database_url.startswith("postgresql+asyncpg://"):
+        database_url = database_url.replace("postgresql+asyncpg://", "postgresql://")
+    return database_url
+
+
+async def _setup_connection(conn: asyncpg.Connection) -> None:
+    """Configure codecs and session settings once per physical connection"""
+    for json_type in ("json", "jsonb"):
+        await conn.set_type_codec(
+            json_type,
+            encoder=json.dumps,
+            decoder=json.loads,
+            schema="pg_catalog"
+        )
+    await conn.execute("SET TIME ZONE 'UTC'")
+
+
+async def get_pool() -> asyncpg.Pool:
+    """Get the shared asyncpg pool, creating it on first use"""
+    global _pool
+
+    if _pool is None:
+        _pool = await asyncpg.create_pool(
+            get_dsn(),
+            min_size=2,
+            max_size=5,
+            init=_setup_connection
+        )
+        logger.info("Maintenance pool created successfully")
+
+    return _pool
+
+
+async def close_pool() -> None:
+    """Close the shared asyncpg pool"""
+    global _pool
+
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+async def table_exists(conn: asyncpg.Connection, table_name: str, schema: str = "public") -> bool:
+    """Check table existence via pg_catalog rather than information_schema"""
+    return await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", f"{schema}.{table_name}")
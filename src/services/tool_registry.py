@@ -1,5 +1,6 @@
-from typing import Dict, Any, List, Optional
+from typing import Awaitable, Callable, Dict, Any, List, Optional
 from dataclasses import dataclass
+from functools import partial
 from datetime import datetime
 
 @dataclass
@@ -36,6 +37,10 @@ class ToolRegistry:
         """Get a tool by name"""
         return self.tools.get(tool_name)
     
+    def get_tool_callable(self, tool_name: str) -> Callable[..., Awaitable[Dict[str, Any]]]:
+        """Get execute_tool pre-bound to a tool name, for agent dispatch tables"""
+        return partial(self.execute_tool, tool_name)
+    
     def _register_default_tools(self):
         """Register the default set of tools"""
         